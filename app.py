@@ -1,12 +1,18 @@
 
 import os
-import glob
-import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
-from io import BytesIO
 import streamlit as st
 
+from log_cache import QUARANTINE_STATUSES, data_version, load_manifest
+from log_charts import chart_png
+from log_cube import count_by, load_cube, slice_cube
+from log_export import EXCEL_MIME, build_excel_export
+from log_filters import get_filter_engine, get_sender_index
+from log_index import get_log_index, period_range
+from log_loader import load_compact_logs, load_text, with_text
+from log_summary import load_daily_summary
+from log_table import render_log_table
+
 # 📁 Pad naar logs
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
@@ -36,67 +42,61 @@ all_logs_toggle = st.sidebar.checkbox("📊 Toon totaaloverzicht van alle logs")
 if st.sidebar.button("❌ Reset filters"):
     st.session_state["selected_cats"] = []
     st.session_state["selected_senders"] = []
+    st.session_state["sender_query"] = ""
     st.rerun()
 
 # 🔍 Bestanden ophalen
 def get_log_files(mode, ref_date):
+    log_index = get_log_index(LOGS_DIR)
     if all_logs_toggle:
-        return glob.glob(os.path.join(LOGS_DIR, "mail_log_*.xlsx"))
-    if mode == "Dag":
-        return [os.path.join(LOGS_DIR, f"mail_log_{ref_date.strftime('%Y-%m-%d')}.xlsx")]
-    elif mode == "Week":
-        start = ref_date - pd.to_timedelta(ref_date.weekday(), unit="D")
-        return [os.path.join(LOGS_DIR, f"mail_log_{(start + pd.to_timedelta(i, unit='D')).strftime('%Y-%m-%d')}.xlsx") for i in range(7)]
-    elif mode == "Maand":
-        month_str = ref_date.strftime('%Y-%m')
-        return glob.glob(os.path.join(LOGS_DIR, f"mail_log_{month_str}-*.xlsx"))
+        return log_index.all_files()
+    return log_index.files_between(*period_range(mode, ref_date))
 
 log_files = get_log_files(period_mode, selected_date)
 
-# 📥 Data inladen
-df_list = []
-for path in log_files:
-    if os.path.exists(path):
-        try:
-            df_temp = pd.read_excel(path)
-            df_temp["Bestand"] = os.path.basename(path)
-            df_list.append(df_temp)
-        except:
-            continue
-
-df = pd.concat(df_list, ignore_index=True) if df_list else pd.DataFrame()
-
-if not df.empty:
-    df["Categorie"] = df["Categorie"].fillna("Onbekend")
-    df["Beantwoord"] = df["Beantwoord"].fillna("Nee")
-    df["Tijdstip"] = pd.to_datetime(df["Tijdstip"], errors="coerce")
-    df["Uur"] = df["Tijdstip"].dt.hour
-    if "Antwoord" in df.columns:
-        df.loc[df["Antwoord"].notna() & (df["Antwoord"].astype(str).str.strip() != ""), "Beantwoord"] = "Ja"
+def load_app_log(log_files):
+    # De antwoordtekst is alleen nodig voor de Beantwoord-regel; die wordt per
+    # dag toegepast en daarna wordt de tekst per pagina of export opnieuw opgehaald
+    return load_compact_logs(log_files, answered_from_text=True)
+
+# 📥 Data inladen (telkubus; ruwe regels pas bij het tonen van de log)
+cube = load_cube(log_files)
+
+# 🚫 Logbestanden die niet te lezen zijn (of vereiste kolommen missen)
+quarantined = load_manifest(log_files)
+quarantined = quarantined[quarantined["Status"].isin(QUARANTINE_STATUSES)]
+if not quarantined.empty:
+    with st.sidebar.expander(f"⚠️ {len(quarantined)} logbestand(en) overgeslagen"):
+        st.dataframe(quarantined[["Bestand", "Status", "Detail"]], hide_index=True)
+
+if not cube.empty:
+    # De kubus wordt gedeeld tussen sessies: niet in-place aanpassen
+    cube = cube.assign(Beantwoord=cube["Beantwoord"].mask(cube["HeeftAntwoord"], "Ja"))
 
     with st.sidebar:
         st.header("📂 Filters")
-        selected_cats = st.multiselect("Categorieën", sorted(df["Categorie"].unique()),
+        selected_cats = st.multiselect("Categorieën", sorted(cube["Categorie"].unique()),
                                        default=st.session_state.get("selected_cats", []),
                                        key="selected_cats", placeholder="Kies een optie")
-        selected_senders = st.multiselect("Afzenders", sorted(df["Afzender"].unique()),
-                                          default=st.session_state.get("selected_senders", []),
+        sender_index = get_sender_index(data_version(log_files), cube)
+        sender_query = st.text_input("🔍 Zoek afzender", key="sender_query",
+                                     placeholder=f"{len(sender_index)} afzenders – typ om te zoeken")
+        current_senders = st.session_state.get("selected_senders", [])
+        sender_options = list(dict.fromkeys(current_senders + sender_index.search(sender_query)))
+        selected_senders = st.multiselect("Afzenders", sender_options,
+                                          default=current_senders,
                                           key="selected_senders", placeholder="Kies een optie")
 
-    filtered_df = df.copy()
-    if selected_cats:
-        filtered_df = filtered_df[filtered_df["Categorie"].isin(selected_cats)]
-    if selected_senders:
-        filtered_df = filtered_df[filtered_df["Afzender"].isin(selected_senders)]
+    filtered_cube = slice_cube(cube, selected_cats, selected_senders)
 
     # 📈 Statistieken
     st.markdown("---")
     st.markdown("## 📈 Statistieken")
-    total_mails = len(filtered_df)
-    unique_senders = filtered_df["Afzender"].nunique()
-    answered_count = filtered_df[filtered_df["Beantwoord"] == "Ja"].shape[0]
+    total_mails = int(filtered_cube["Aantal"].sum())
+    unique_senders = filtered_cube["Afzender"].nunique()
+    answered_count = int(filtered_cube.loc[filtered_cube["Beantwoord"] == "Ja", "Aantal"].sum())
     answered_pct = (answered_count / total_mails * 100) if total_mails > 0 else 0
-    complaints_count = filtered_df[filtered_df["Categorie"] == "Klacht"].shape[0]
+    complaints_count = int(filtered_cube.loc[filtered_cube["Categorie"] == "Klacht", "Aantal"].sum())
 
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("📬 Totaal e-mails", total_mails)
@@ -106,91 +106,55 @@ if not df.empty:
 
     # ➕ Gemiddelden
     if not all_logs_toggle:
-        all_files = glob.glob(os.path.join(LOGS_DIR, "mail_log_*.xlsx"))
-        all_data = []
-        for f in all_files:
-            try:
-                d = pd.read_excel(f)
-                d["Beantwoord"] = d["Beantwoord"].fillna("Nee")
-                d["Categorie"] = d["Categorie"].fillna("Onbekend")
-                all_data.append(d)
-            except:
-                continue
-        if all_data:
-            df_all = pd.concat(all_data, ignore_index=True)
-            total_all = len(df_all)
-            avg_answered = df_all[df_all["Beantwoord"] == "Ja"].shape[0] / total_all * 100
-            avg_complaints = df_all[df_all["Categorie"] == "Klacht"].shape[0] / total_all * 100
+        summary = load_daily_summary(LOGS_DIR)
+        total_all = summary["Totaal"].sum()
+        if total_all > 0:
+            avg_answered = summary["Beantwoord"].sum() / total_all * 100
+            avg_complaints = summary.loc[summary["Categorie"] == "Klacht", "Totaal"].sum() / total_all * 100
             st.markdown(f"<div style='margin-top:-10px; font-size:0.9em; color:gray;'>Gemiddeld (alle logs): {avg_answered:.0f}% beantwoord • {avg_complaints:.0f}% klachten</div>", unsafe_allow_html=True)
 
     # 📄 Tabel en download
     st.markdown("---")
     st.markdown("## 📄 Geselecteerde log")
 
-    excel_buffer = BytesIO()
-    with pd.ExcelWriter(excel_buffer, engine="xlsxwriter") as writer:
-        filtered_df.to_excel(writer, index=False, sheet_name="Log")
-        workbook = writer.book
-        worksheet = writer.sheets["Log"]
-        header_format = workbook.add_format({"bold": True, "bg_color": "#D9E1F2", "border": 1})
-        for col_num, value in enumerate(filtered_df.columns.values):
-            worksheet.write(0, col_num, value, header_format)
-            max_len = max(filtered_df[value].astype(str).map(len).max(), len(value))
-            worksheet.set_column(col_num, col_num, max_len + 2)
-        green_fill = workbook.add_format({'bg_color': '#C6EFCE'})
-        red_fill = workbook.add_format({'bg_color': '#FFC7CE'})
-        antwoord_idx = filtered_df.columns.get_loc("Beantwoord")
-        for row_num, val in enumerate(filtered_df["Beantwoord"], start=1):
-            kleur = green_fill if val == "Ja" else red_fill
-            worksheet.write(row_num, antwoord_idx, val, kleur)
-
-    def highlight_row(row):
-        if row["Categorie"] == "Klacht":
-            return ["background-color: #fff3cd"] * len(row)
-        elif row["Beantwoord"] == "Nee":
-            return ["background-color: #f8d7da"] * len(row)
-        return [""] * len(row)
-
-    st.dataframe(filtered_df.style.apply(highlight_row, axis=1))
-    st.download_button("⬇️ Download Excel-bestand", data=excel_buffer.getvalue(),
-                       file_name="filtered_emails_export.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-
-    # 📊 Grafieken
-    def render_and_download(fig, title, filename):
-        st.pyplot(fig)
-        buf = BytesIO()
-        fig.savefig(buf, format="png", bbox_inches="tight")
-        st.download_button(f"⬇️ Download PNG – {title}", data=buf.getvalue(), file_name=filename, mime="image/png")
+    if st.toggle("📄 Toon geselecteerde log"):
+        version = data_version(log_files)
+        raw_df = load_app_log(log_files)
+        engine = get_filter_engine(version, raw_df)
+        rows = engine.rows(Categorie=selected_cats, Afzender=selected_senders)
+        render_log_table(raw_df, rows, key="app_log", highlight=True, version=("app", version),
+                         load_text=lambda page_rows: load_text(raw_df, page_rows, log_files))
+
+        # Het Excel-bestand wordt pas gebouwd als iemand erom vraagt
+        if st.button("📦 Genereer Excel-bestand"):
+            st.download_button("⬇️ Download Excel-bestand", data=build_excel_export(with_text(raw_df, rows, log_files)),
+                               file_name="filtered_emails_export.xlsx", mime=EXCEL_MIME)
+
+    # 📊 Grafieken (PNG uit de cache zolang de tellingen gelijk blijven)
+    def render_and_download(png, title, filename):
+        st.image(png, use_container_width=True)
+        st.download_button(f"⬇️ Download PNG – {title}", data=png, file_name=filename, mime="image/png")
 
     st.markdown("---")
     st.markdown("## 📊 Verdeling per categorie")
-    cat_counts = filtered_df["Categorie"].value_counts()
-    fig1, ax1 = plt.subplots(figsize=(10, 6))
-    cat_counts.plot(kind="bar", ax=ax1, color="#4e79a7")
-    ax1.set_title("E-mails per categorie")
-    render_and_download(fig1, "Categorieën", "categorie_balk.png")
+    cat_counts = count_by(filtered_cube, "Categorie")
+    png1 = chart_png(cat_counts, "bar", "E-mails per categorie", figsize=(10, 6), color="#4e79a7")
+    render_and_download(png1, "Categorieën", "categorie_balk.png")
 
     st.markdown("## 🥧 Categorieverhouding")
-    fig2, ax2 = plt.subplots()
-    cat_counts.plot(kind="pie", autopct="%1.1f%%", startangle=90, ax=ax2)
-    ax2.set_ylabel("")
-    ax2.set_title("Verhouding per categorie")
-    render_and_download(fig2, "Taartdiagram", "categorie_taart.png")
+    png2 = chart_png(cat_counts, "pie", "Verhouding per categorie", ylabel="", autopct="%1.1f%%", startangle=90)
+    render_and_download(png2, "Taartdiagram", "categorie_taart.png")
 
     st.markdown("## ✅ Beantwoord-status")
-    answered_counts = filtered_df["Beantwoord"].value_counts()
-    fig3, ax3 = plt.subplots()
-    answered_counts.plot(kind="bar", ax=ax3, color=["#e15759", "#59a14f"])
-    ax3.set_title("Beantwoord-status")
-    render_and_download(fig3, "Beantwoord", "beantwoord_status.png")
+    answered_counts = count_by(filtered_cube, "Beantwoord")
+    png3 = chart_png(answered_counts, "bar", "Beantwoord-status", color=["#e15759", "#59a14f"])
+    render_and_download(png3, "Beantwoord", "beantwoord_status.png")
 
     st.markdown("## 🕒 Tijdlijn: E-mails per uur")
-    if not filtered_df["Uur"].isna().all():
-        hourly = filtered_df["Uur"].value_counts().sort_index()
-        fig4, ax4 = plt.subplots()
-        hourly.plot(kind="bar", ax=ax4, color="#f28e2b")
-        ax4.set_title("E-mails per uur")
-        render_and_download(fig4, "Tijdlijn", "tijdlijn_per_uur.png")
+    hourly = count_by(filtered_cube, "Uur").sort_index()
+    if not hourly.empty:
+        png4 = chart_png(hourly, "bar", "E-mails per uur", color="#f28e2b")
+        render_and_download(png4, "Tijdlijn", "tijdlijn_per_uur.png")
 
 else:
     st.warning("❌ Geen gegevens beschikbaar voor de geselecteerde periode.")
\ No newline at end of file
@@ -0,0 +1,151 @@
+# 📂 batch_report.py
+# Rapporten voor een hele reeks periodes in één keer, zonder Streamlit.
+# Per periode (Dag, Week of Maand) komen er een PDF-rapport, een Excel-export en
+# PNG-grafieken uit, met dezelfde laad- en aggregatiecode als de dashboards.
+# Periodes van één weergave overlappen niet, dus elke worker in de procespool
+# leest zijn eigen logbestanden en elk logbestand wordt precies één keer geladen.
+#
+#   python batch_report.py --van 2025-06-01 --tot 2025-08-31 --weergave Week --uit rapporten
+
+import os
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from log_charts import chart_png
+from log_cube import build_cube, count_by, cube_metrics
+from log_export import build_excel_export
+from log_index import get_log_index, period_range
+from log_loader import load_logs, normalize_logs
+from log_report import build_pdf_report
+
+FORMATS = ("pdf", "xlsx", "png")
+
+
+def report_periods(start, end, mode):
+    """Alle (begin, eind)-periodes van `mode` die het bereik start..end raken."""
+    periods = []
+    day = start
+    while day <= end:
+        period = period_range(mode, day)
+        periods.append(period)
+        day = period[1] + timedelta(days=1)
+    return periods
+
+
+def period_label(mode, start, end):
+    if mode == "Dag":
+        return start.strftime("%Y-%m-%d")
+    return f"{start:%Y-%m-%d} t/m {end:%Y-%m-%d}"
+
+
+def render_period(mode, start, end, log_files, out_dir, formats=FORMATS, logo_path=None):
+    """Maak alle gevraagde bestanden voor één periode; draait in een worker."""
+    started = time.perf_counter()
+    prefix = os.path.join(out_dir, f"mailmind_{mode.lower()}_{start:%Y-%m-%d}")
+    written = []
+
+    # Eén keer inlezen (zonder tweede procespool in de worker en zonder store:
+    # de worker bewaart niets); kubus en export komen uit hetzelfde frame
+    raw = load_logs(log_files, workers=1, store_days=False)
+    if raw.empty:
+        return {"periode": period_label(mode, start, end), "bestanden": [], "rijen": 0,
+                "seconden": time.perf_counter() - started}
+    cube = build_cube(raw)
+
+    metrics = cube_metrics(cube)
+    if "pdf" in formats:
+        with open(f"{prefix}.pdf", "wb") as f:
+            f.write(build_pdf_report(metrics, period_label(mode, start, end), logo_path))
+        written.append(f"{prefix}.pdf")
+
+    if "xlsx" in formats:
+        with open(f"{prefix}.xlsx", "wb") as f:
+            f.write(build_excel_export(normalize_logs(raw)))
+        written.append(f"{prefix}.xlsx")
+
+    if "png" in formats:
+        charts = {
+            "categorie": chart_png(count_by(cube, "Categorie"), "bar", "E-mails per categorie"),
+            "verdeling": chart_png(count_by(cube, "Categorie"), "pie", "", autopct="%1.1f%%"),
+            "per_uur": chart_png(count_by(cube, "Uur").sort_index(), "line", "E-mails per uur", marker="o"),
+        }
+        for name, png in charts.items():
+            with open(f"{prefix}_{name}.png", "wb") as f:
+                f.write(png)
+            written.append(f"{prefix}_{name}.png")
+
+    return {"periode": period_label(mode, start, end), "bestanden": written, "rijen": metrics["total"],
+            "seconden": time.perf_counter() - started}
+
+
+def _render_safe(mode, start, end, *args):
+    # Eén kapotte periode mag de rest van de batch niet tegenhouden
+    try:
+        return render_period(mode, start, end, *args)
+    except Exception as e:
+        return {"periode": period_label(mode, start, end), "bestanden": [], "rijen": 0, "fout": str(e)}
+
+
+def run_batch(logs_dir, start, end, mode, out_dir, formats=FORMATS, workers=None, logo_path=None):
+    """Render alle periodes parallel en geef per periode een korte samenvatting terug."""
+    os.makedirs(out_dir, exist_ok=True)
+    log_index = get_log_index(logs_dir)
+    tasks = [
+        (mode, p_start, p_end, log_index.files_between(p_start, p_end), out_dir, tuple(formats), logo_path)
+        for p_start, p_end in report_periods(start, end, mode)
+    ]
+    tasks = [task for task in tasks if task[3]]
+    workers = workers or os.cpu_count() or 1
+
+    def report(result):
+        print(f"  {result['periode']}: {len(result['bestanden'])} bestand(en), {result['rijen']} mails")
+        return result
+
+    if workers <= 1 or len(tasks) <= 1:
+        return [report(_render_safe(*task)) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(_render_safe, *task) for task in tasks]
+        results = [report(future.result()) for future in as_completed(futures)]
+    return sorted(results, key=lambda r: r["periode"])
+
+
+def main():
+    from dotenv import load_dotenv
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    load_dotenv(os.path.join(base_dir, "Streamlit-dashboard", ".env.dashboard"))
+
+    parser = argparse.ArgumentParser(description="MailMind-rapporten voor een reeks periodes")
+    parser.add_argument("--van", required=True, help="eerste dag (YYYY-MM-DD)")
+    parser.add_argument("--tot", required=True, help="laatste dag (YYYY-MM-DD)")
+    parser.add_argument("--weergave", choices=["Dag", "Week", "Maand"], default="Dag")
+    parser.add_argument("--logs", default=os.path.join(base_dir, "logs"), help="map met mail_log_*.xlsx")
+    parser.add_argument("--uit", default="rapporten", help="map voor de rapporten")
+    parser.add_argument("--formaten", default=",".join(FORMATS), help="kommagescheiden: pdf,xlsx,png")
+    parser.add_argument("--workers", type=int, default=None, help="aantal processen (standaard: aantal cores)")
+    parser.add_argument("--logo", default=os.path.join(base_dir, "Streamlit-dashboard", "assets", "mailmind_logo.png"))
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.van, "%Y-%m-%d").date()
+    end = datetime.strptime(args.tot, "%Y-%m-%d").date()
+    formats = [f.strip().lower() for f in args.formaten.split(",") if f.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"onbekend formaat: {', '.join(sorted(unknown))}")
+
+    started = time.perf_counter()
+    results = run_batch(args.logs, start, end, args.weergave, args.uit, formats, args.workers, args.logo)
+    n_files = sum(len(r["bestanden"]) for r in results)
+    failed = [r for r in results if "fout" in r]
+    print(f"✅ {len(results)} periode(s), {n_files} bestanden in {time.perf_counter() - started:.1f}s → {args.uit}")
+    for r in failed:
+        print(f"❌ {r['periode']}: {r['fout']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# 📂 benchmark.py
+# End-to-end benchmark van de dashboardpijplijn, zonder Streamlit.
+# Genereert (of hergebruikt) een map met synthetische logs en meet elke fase
+# apart: bestanden vinden, inladen (koud, met cache en compact), filteren,
+# aggregeren, Excel/PDF-export en grafieken tekenen. Het resultaat gaat als JSON
+# naar bench_results/, zodat runs met --vergelijk naast elkaar te leggen zijn.
+#
+#   python benchmark.py --dagen 90 --rijen 5000
+#   python benchmark.py --logs /tmp/mm_logs --vergelijk bench_results/vorige.json
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import log_charts
+import log_filters
+from log_cache import CACHE_DIR_NAME
+from log_charts import chart_png
+from log_cube import count_by, cube_metrics, load_cube
+from log_export import build_excel_export
+from log_filters import FilterEngine
+from log_generator import generate_logs
+from log_index import LogIndex
+from log_loader import TEXT_COLUMNS, compact_logs, load_compact_logs, load_logs, normalize_logs, with_text
+from log_report import build_pdf_report
+from log_search import get_text_index
+from log_store import get_store
+from log_summary import daily_series, load_daily_summary
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results")
+
+
+class Timer:
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.phases = {}
+
+    def measure(self, name, func, repeat=None, setup=None):
+        """Voer func `repeat` keer uit en bewaar de tijden; geeft het laatste resultaat terug."""
+        times = []
+        result = None
+        for _ in range(repeat or self.repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+        self.phases[name] = {
+            "min": min(times),
+            "median": statistics.median(times),
+            "runs": len(times),
+        }
+        print(f"  {name:<28} {min(times) * 1000:10.1f} ms")
+        return result
+
+
+def clear_memory_caches():
+    get_store().clear()
+    log_charts._cache.clear()
+    log_filters._engines.clear()
+    log_filters._sender_indexes.clear()
+
+
+def clear_disk_cache(logs_dir):
+    shutil.rmtree(os.path.join(logs_dir, CACHE_DIR_NAME), ignore_errors=True)
+
+
+def run_benchmark(logs_dir, repeat=3, workers=None, export_rows=50_000):
+    timer = Timer(repeat)
+
+    log_files = timer.measure("discovery", lambda: LogIndex(logs_dir).all_files())
+
+    # Koud: geen Parquet-cache en lege geheugenstore, dus alles via openpyxl
+    timer.measure("load_cold", lambda: load_logs(log_files, workers),
+                  repeat=1, setup=lambda: (clear_disk_cache(logs_dir), clear_memory_caches()))
+    timer.measure("load_warm", lambda: load_logs(log_files, workers), setup=clear_memory_caches)
+    # Alleen normaliseren en compact maken, op een al ingelezen ruw frame (geen I/O);
+    # normalize_logs past het frame aan, dus elke run krijgt een verse kopie
+    raw = load_logs(log_files, workers, drop=TEXT_COLUMNS)
+    fresh = []
+    timer.measure("normalize", lambda: compact_logs(normalize_logs(fresh.pop())),
+                  setup=lambda: fresh.append(raw.copy()))
+    del raw
+    # Per dag genormaliseerd en compact, zoals de logtabel van het dashboard
+    df = timer.measure("load_compact", lambda: load_compact_logs(log_files, workers), setup=clear_memory_caches)
+
+    cats = df["Categorie"].value_counts().index[:2].tolist()
+    senders = df["Afzender"].value_counts().index[:5].tolist()
+    engine = timer.measure("filter_engine", lambda: FilterEngine(df))
+    rows = timer.measure("filter_rows", lambda: engine.rows(Categorie=cats, Afzender=senders))
+    text_index = timer.measure("search_index", lambda: get_text_index(("bench",), log_files, df, workers),
+                               repeat=1, setup=clear_memory_caches)
+    timer.measure("search_query", lambda: (text_index.rows("retour"), text_index.rows("terug*"),
+                                           text_index.rows("levering binnen")))
+
+    # Eerste keer: kubus per dag opbouwen uit de ruwe cache; daarna uit de kubuscache
+    timer.measure("cube_build", lambda: load_cube(log_files, workers), repeat=1, setup=clear_memory_caches)
+    cube = timer.measure("cube_warm", lambda: load_cube(log_files, workers), setup=clear_memory_caches)
+    timer.measure("aggregate", lambda: (cube_metrics(cube), count_by(cube, "Categorie"),
+                                        count_by(cube, "Uur"), count_by(cube, "Afzender")))
+    timer.measure("daily_summary_build", lambda: load_daily_summary(logs_dir, log_files), repeat=1)
+    summary = timer.measure("daily_summary_warm", lambda: load_daily_summary(logs_dir, log_files))
+    timer.measure("daily_series", lambda: daily_series(summary))
+
+    export_positions = np.arange(min(export_rows, len(df)))
+    timer.measure("export_excel", lambda: build_excel_export(with_text(df, export_positions, log_files)), repeat=1)
+    timer.measure("export_pdf", lambda: build_pdf_report(cube_metrics(cube)))
+
+    def charts():
+        chart_png(count_by(cube, "Categorie"), "bar", "Categorieën")
+        chart_png(count_by(cube, "Categorie"), "pie", "", autopct="%1.1f%%")
+        chart_png(count_by(cube, "Uur").sort_index(), "line", "Per uur", marker="o")
+    timer.measure("charts_cold", charts, setup=log_charts._cache.clear)
+    timer.measure("charts_cached", charts)
+
+    return {
+        "files": len(log_files),
+        "rows": len(df),
+        "filtered_rows": len(rows),
+        "export_rows": len(export_positions),
+        "phases": timer.phases,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(current, previous):
+    print(f"\n{'fase':<28} {'vorige':>10} {'nu':>10} {'factor':>8}")
+    for name, phase in current["phases"].items():
+        old = previous.get("phases", {}).get(name)
+        if old is None:
+            print(f"{name:<28} {'-':>10} {phase['min'] * 1000:10.1f}")
+            continue
+        factor = phase["min"] / old["min"] if old["min"] else float("nan")
+        flag = "  ⚠️" if factor > 1.2 else ""
+        print(f"{name:<28} {old['min'] * 1000:10.1f} {phase['min'] * 1000:10.1f} {factor:7.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark van de MailMind-dashboardpijplijn")
+    parser.add_argument("--logs", help="bestaande map met logs (anders tijdelijk gegenereerd)")
+    parser.add_argument("--dagen", type=int, default=30)
+    parser.add_argument("--rijen", type=int, default=1000, help="gemiddeld aantal rijen per dag")
+    parser.add_argument("--herhaal", type=int, default=3, help="aantal metingen per fase")
+    parser.add_argument("--workers", type=int, default=None, help="procespool voor het inladen")
+    parser.add_argument("--export-rijen", type=int, default=50_000)
+    parser.add_argument("--uitvoer", help="JSON-bestand (standaard bench_results/benchmark_<tijd>.json)")
+    parser.add_argument("--vergelijk", help="eerder JSON-resultaat om mee te vergelijken")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    logs_dir = args.logs
+    if logs_dir is None:
+        tmp_dir = tempfile.mkdtemp(prefix="mailmind_bench_")
+        logs_dir = tmp_dir
+        print(f"📝 {args.dagen} dagen × ~{args.rijen} rijen genereren in {logs_dir}")
+        generate_logs(logs_dir, date.today() - timedelta(days=args.dagen), args.dagen, args.rijen,
+                      lock_files=2, corrupt_files=1)
+
+    try:
+        print("⏱️ Fasen:")
+        result = run_benchmark(logs_dir, args.herhaal, args.workers, args.export_rijen)
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    result["meta"] = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "logs": args.logs,
+        "days": args.dagen if args.logs is None else None,
+        "rows_per_day": args.rijen if args.logs is None else None,
+        "repeat": args.herhaal,
+        "workers": args.workers,
+    }
+
+    output = args.uitvoer or os.path.join(RESULTS_DIR, f"benchmark_{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\n💾 Resultaat opgeslagen in {output}")
+
+    if args.vergelijk:
+        with open(args.vergelijk, encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
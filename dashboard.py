@@ -1,24 +1,35 @@
 # 📂 scripts/dashboard.py
 
 import os
-import glob
+import io
+import marshal
+import pstats
+import cProfile
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
 from io import BytesIO
 import streamlit as st
-from fpdf import FPDF
 import zipfile
-import tempfile
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.application import MIMEApplication
-import schedule
-import time
-import threading
 from dotenv import load_dotenv
 
+from log_cache import QUARANTINE_STATUSES, data_version, load_manifest
+from log_charts import chart_png
+from log_cube import count_by, cube_metrics, load_cube, slice_cube
+from log_export import EXCEL_MIME, build_excel_export
+from log_filters import get_filter_engine, get_sender_index
+from log_index import get_log_index, period_range
+from log_perf import METRICS_LOG, finish_run, hit_rate, phase, start_run
+from log_loader import load_compact_logs, load_text, with_text
+from log_report import build_pdf_report
+from log_search import get_text_index
+from log_similar import MATCH_THRESHOLD, similar_responses
+from log_store import get_store
+from log_summary import load_daily_summary
+from log_trends import RESOLUTIONS, trend_series, year_over_year
+from log_table import render_log_table
+from report_worker import start_report_worker
+
 # --------------------
 # 🔐 Login functionaliteit
 # --------------------
@@ -46,11 +57,18 @@ def check_login():
 
 check_login()
 
+# ⏱️ Tijdmeting per rerun; profileren alleen als dat in de Config-tab is aangezet
+profiler = cProfile.Profile() if st.session_state.pop("profile_next_run", False) else None
+if profiler is not None:
+    profiler.enable()
+start_run("dashboard")
+
 # --------------------
 # ⚙️ Basisinstellingen
 # --------------------
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
+LOGO_PATH = os.path.join(BASE_DIR, "Streamlit-dashboard", "assets", "mailmind_logo.png")
 
 # 🚀 Dashboard gebruikt eigen .env
 load_dotenv(os.path.join(BASE_DIR, "Streamlit-dashboard", ".env.dashboard"))
@@ -70,10 +88,10 @@ with col_title:
         """
     )
 
-st_autorefresh = st.sidebar.checkbox("🔄 Auto-refresh elke minuut")
-if st_autorefresh:
-    st.experimental_set_query_params(refresh=datetime.now().strftime("%H:%M:%S"))
-    st.experimental_rerun()
+# Auto-refresh kijkt elke REFRESH_SECONDS alleen naar de logbestanden (mtime en
+# grootte) en herlaadt het dashboard pas als er echt iets veranderd is.
+REFRESH_SECONDS = int(os.getenv("MAILMIND_REFRESH_SECONDS", "60"))
+st_autorefresh = st.sidebar.checkbox("🔄 Auto-refresh bij gewijzigde logs")
 
 # --------------------
 # 📑 Tabs
@@ -86,19 +104,10 @@ tab_stats, tab_logs, tab_graphs, tab_trends, tab_export, tab_config = st.tabs(
 # 📂 Data ophalen
 # --------------------
 def get_log_files(mode, ref_date, all_logs_toggle):
+    log_index = get_log_index(LOGS_DIR)
     if all_logs_toggle:
-        return glob.glob(os.path.join(LOGS_DIR, "mail_log_*.xlsx"))
-    if mode == "Dag":
-        return [os.path.join(LOGS_DIR, f"mail_log_{ref_date.strftime('%Y-%m-%d')}.xlsx")]
-    elif mode == "Week":
-        start = ref_date - pd.to_timedelta(ref_date.weekday(), unit="D")
-        return [
-            os.path.join(LOGS_DIR, f"mail_log_{(start + pd.to_timedelta(i, unit='D')).strftime('%Y-%m-%d')}.xlsx")
-            for i in range(7)
-        ]
-    elif mode == "Maand":
-        month_str = ref_date.strftime("%Y-%m")
-        return glob.glob(os.path.join(LOGS_DIR, f"mail_log_{month_str}-*.xlsx"))
+        return log_index.all_files()
+    return log_index.files_between(*period_range(mode, ref_date))
 
 st.sidebar.markdown("### 📂 Filters")
 all_logs_toggle = st.sidebar.checkbox("📊 Toon totaaloverzicht van alle logs")
@@ -113,43 +122,65 @@ with col_mode:
 with col_date:
     selected_date = st.date_input("Datum", value=datetime.today())
 
-log_files = get_log_files(period_mode, selected_date, all_logs_toggle)
+with phase("bestanden zoeken") as info:
+    log_files = get_log_files(period_mode, selected_date, all_logs_toggle)
+    info["rows"] = len(log_files)
+
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def watch_logs(mode, ref_date, all_logs, seen_version):
+    # Draait los van de rest van de pagina; een volledige rerun leest daarna via
+    # de cache alleen de gewijzigde dag(en) opnieuw in.
+    if data_version(get_log_files(mode, ref_date, all_logs)) != seen_version:
+        st.rerun()
+    st.caption(f"🔄 Laatst gecontroleerd: {datetime.now().strftime('%H:%M:%S')}")
+
+if st_autorefresh:
+    with st.sidebar:
+        watch_logs(period_mode, selected_date, all_logs_toggle, data_version(log_files))
+
+with phase("kubus laden") as info:
+    cube = load_cube(log_files)
+    info["rows"] = int(cube["Aantal"].sum()) if not cube.empty else 0
 
-df_list = []
-for path in log_files:
-    if os.path.exists(path):
-        try:
-            df_temp = pd.read_excel(path)
-            df_temp["Bestand"] = os.path.basename(path)
-            df_list.append(df_temp)
-        except:
-            continue
+# 🚫 Logbestanden die niet te lezen zijn (of vereiste kolommen missen)
+quarantined = load_manifest(log_files)
+quarantined = quarantined[quarantined["Status"].isin(QUARANTINE_STATUSES)]
+if not quarantined.empty:
+    with st.sidebar.expander(f"⚠️ {len(quarantined)} logbestand(en) overgeslagen"):
+        st.dataframe(quarantined[["Bestand", "Status", "Detail"]], hide_index=True)
 
-df = pd.concat(df_list, ignore_index=True) if df_list else pd.DataFrame()
+
+_raw_logs = []
+
+
+def load_raw_logs():
+    # Ruwe regels zijn alleen nodig voor de logtabel en de Excel-export. De
+    # compacte dagen (zonder vrije tekst) staan gedeeld in de store; per rerun
+    # wordt de periode hooguit één keer samengevoegd.
+    if not _raw_logs:
+        with phase("logregels laden") as info:
+            _raw_logs.append(load_compact_logs(log_files))
+            info["rows"] = len(_raw_logs[0])
+    return _raw_logs[0]
 
 # --------------------
 # 📈 Statistieken tab
 # --------------------
 with tab_stats:
-    if not df.empty:
-        df["Categorie"] = df["Categorie"].fillna("Onbekend")
-        df["Beantwoord"] = df["Beantwoord"].fillna("Nee")
-        if "Reden" not in df.columns:
-            df["Reden"] = None
-        df["Tijdstip"] = pd.to_datetime(df["Tijdstip"], errors="coerce")
-        df["Uur"] = df["Tijdstip"].dt.hour
-
-        total_mails = len(df)
-        unique_senders = df["Afzender"].nunique()
-        answered_count = df[df["Beantwoord"] == "Ja"].shape[0]
-        answered_pct = (answered_count / total_mails * 100) if total_mails > 0 else 0
+    if not cube.empty:
+        metrics = cube_metrics(cube)
+        total_mails = metrics["total"]
+        unique_senders = metrics["unique_senders"]
+        answered_count = metrics["answered"]
+        answered_pct = metrics["answered_pct"]
 
         # ✅ Klachten tellen (alle varianten met 'klacht')
-        complaints_count = df[df["Categorie"].str.contains("klacht", case=False, na=False)].shape[0]
+        complaints_count = metrics["complaints"]
 
         # ✅ Fallbacks tellen (alles met ingevulde reden)
-        fallback_count = df[df["Reden"].fillna("").str.strip() != ""].shape[0]
-        fallback_pct = (fallback_count / total_mails * 100) if total_mails > 0 else 0
+        fallback_count = metrics["fallbacks"]
+        fallback_pct = metrics["fallback_pct"]
         ai_count = answered_count
 
         col1, col2, col3 = st.columns(3)
@@ -173,24 +204,62 @@ with tab_stats:
 # 📄 Logs tab
 # --------------------
 with tab_logs:
-    if not df.empty:
-        selected_cats = st.multiselect("Categorieën", sorted(df["Categorie"].unique()))
-        selected_senders = st.multiselect("Afzenders", sorted(df["Afzender"].unique()))
-        selected_reasons = st.multiselect("Fallback-redenen", sorted(df["Reden"].dropna().unique()))
-
-        filtered_df = df.copy()
-        if selected_cats:
-            filtered_df = filtered_df[filtered_df["Categorie"].isin(selected_cats)]
-        if selected_senders:
-            filtered_df = filtered_df[filtered_df["Afzender"].isin(selected_senders)]
-        if selected_reasons:
-            filtered_df = filtered_df[filtered_df["Reden"].isin(selected_reasons)]
-
-        st.dataframe(filtered_df)
-
-        if not filtered_df["Reden"].isna().all():
+    if not cube.empty:
+        selected_cats = st.multiselect("Categorieën", sorted(cube["Categorie"].unique()))
+        sender_index = get_sender_index(data_version(log_files), cube)
+        sender_query = st.text_input("🔍 Zoek afzender", placeholder=f"{len(sender_index)} afzenders – typ om te zoeken")
+        current_senders = st.session_state.get("log_senders", [])
+        sender_options = list(dict.fromkeys(current_senders + sender_index.search(sender_query)))
+        selected_senders = st.multiselect("Afzenders", sender_options, default=current_senders, key="log_senders")
+        selected_reasons = st.multiselect("Fallback-redenen", sorted(cube["Reden"].dropna().unique()))
+
+        if st.toggle("📄 Toon logregels"):
+            raw_df = load_raw_logs()
+            version = data_version(log_files)
+            search_query = st.text_input("🔎 Zoek in antwoord, reden en afzender", key="log_search",
+                                         placeholder="bijv. retour, terugbet* of retour levering")
+            with phase("filteren") as info:
+                engine = get_filter_engine(version, raw_df)
+                rows = engine.rows(Categorie=selected_cats, Afzender=selected_senders, Reden=selected_reasons)
+                info["rows"] = len(rows)
+            if search_query.strip():
+                with phase("zoeken") as info:
+                    text_index = get_text_index(version, log_files, raw_df)
+                    hits = text_index.rows(search_query)
+                    if hits is not None:
+                        rows = np.intersect1d(rows, hits, assume_unique=True)
+                    info["rows"] = len(rows)
+                st.caption(f"🔎 {len(rows)} regel(s) gevonden")
+            with phase("logtabel", rows=len(rows)):
+                render_log_table(raw_df, rows, key="dashboard_log", version=("dashboard", version),
+                                 load_text=lambda page_rows: load_text(raw_df, page_rows, log_files))
+
+        reason_counts = count_by(slice_cube(cube, selected_cats, selected_senders, selected_reasons), "Reden")
+        if not reason_counts.empty:
             st.markdown("### 📊 Fallbacks per reden")
-            st.bar_chart(filtered_df["Reden"].value_counts())
+            st.bar_chart(reason_counts)
+
+        if not reason_counts.empty and st.toggle("🧭 Vergelijkbare historische antwoorden bij fallbacks"):
+            raw_df = load_raw_logs()
+            engine = get_filter_engine(data_version(log_files), raw_df)
+            rows = engine.rows(Categorie=selected_cats, Afzender=selected_senders, Reden=selected_reasons)
+            rows = rows[raw_df["Reden"].notna().to_numpy()[rows]]
+            with phase("vergelijkbare antwoorden", rows=len(rows)):
+                columns = [c for c in ("Tijdstip", "Afzender", "Onderwerp", "Reden") if c in raw_df.columns]
+                fallbacks = raw_df.take(rows)[columns]
+                fallbacks = fallbacks.join(load_text(raw_df, rows, log_files, columns=("Inhoud",)))
+                matches = similar_responses(LOGS_DIR, fallbacks)
+            if matches.empty:
+                st.info("Geen historische antwoorden beschikbaar (logs/historical_responses_cleaned.xlsx ontbreekt of is leeg).")
+            else:
+                best = matches[matches["Rang"] == 1].set_index("Regel")
+                usable = int((best["Score"] >= MATCH_THRESHOLD).sum())
+                st.caption(f"{usable} van {len(best)} fallback(s) lijken op een historisch antwoord "
+                           f"(score ≥ {MATCH_THRESHOLD:.2f})")
+                st.dataframe(fallbacks.drop(columns="Inhoud").join(best.drop(columns="Rang"))
+                             .sort_values("Score", ascending=False), hide_index=True)
+                with st.expander("Top-3 per fallback"):
+                    st.dataframe(matches, hide_index=True)
     else:
         st.info("Geen logs gevonden voor deze periode.")
 
@@ -198,22 +267,22 @@ with tab_logs:
 # 📊 Grafieken tab
 # --------------------
 with tab_graphs:
-    if not df.empty:
+    if not cube.empty:
         st.markdown("### 📊 E-mails per categorie")
-        st.bar_chart(df["Categorie"].value_counts())
+        st.bar_chart(count_by(cube, "Categorie"))
 
         st.markdown("### 🥧 Verdeling per categorie")
-        st.pyplot(df["Categorie"].value_counts().plot(kind="pie", autopct="%1.1f%%").get_figure())
+        st.image(chart_png(count_by(cube, "Categorie"), "pie", "", autopct="%1.1f%%"))
 
         st.markdown("### 🤖 AI vs Fallback")
         counts = pd.Series({"AI": ai_count, "Fallback": fallback_count})
         st.bar_chart(counts)
 
         st.markdown("### ✅ Beantwoord-status")
-        st.bar_chart(df["Beantwoord"].value_counts())
+        st.bar_chart(count_by(cube, "Beantwoord"))
 
         st.markdown("### 🕒 E-mails per uur")
-        st.bar_chart(df["Uur"].value_counts().sort_index())
+        st.bar_chart(count_by(cube, "Uur").sort_index())
     else:
         st.info("Geen grafieken beschikbaar.")
 
@@ -221,15 +290,36 @@ with tab_graphs:
 # 📆 Trends tab
 # --------------------
 with tab_trends:
-    if not df.empty:
-        df["Datum"] = df["Tijdstip"].dt.date
-        st.markdown("### 📈 Dagelijks aantal e-mails")
-        st.line_chart(df.groupby("Datum").size())
-
-        complaints_daily = df[df["Categorie"].str.contains("klacht", case=False, na=False)].groupby("Datum").size()
-        if not complaints_daily.empty:
-            st.markdown("### 🚨 Klachten per dag")
-            st.line_chart(complaints_daily)
+    with phase("dagoverzicht"):
+        summary = load_daily_summary(LOGS_DIR)
+    if not summary.empty:
+        # Standaard de gekozen periode; elk bereik (ook meerdere jaren) kan
+        first_day, last_day = summary["Datum"].min().date(), summary["Datum"].max().date()
+        default_range = (first_day, last_day) if all_logs_toggle else period_range(period_mode, selected_date)
+        col_range, col_resolution = st.columns([3, 1])
+        with col_range:
+            trend_range = st.date_input("📅 Trendperiode", value=default_range)
+        with col_resolution:
+            resolution_choice = st.selectbox("Resolutie", ["Automatisch"] + RESOLUTIONS)
+
+        if len(trend_range) == 2:
+            with phase("trendreeks") as info:
+                resolution, trend = trend_series(LOGS_DIR, *trend_range,
+                                                 None if resolution_choice == "Automatisch" else resolution_choice,
+                                                 summary=summary)
+                info["rows"] = len(trend)
+            st.caption(f"{len(trend)} punten per {resolution.lower()}")
+
+            st.markdown("### 📈 Aantal e-mails")
+            st.line_chart(trend["Totaal"])
+
+            if trend["Klachten"].sum() > 0:
+                st.markdown("### 🚨 Klachten")
+                st.line_chart(trend["Klachten"])
+
+            if trend_range[0].year != trend_range[1].year:
+                st.markdown("### 📅 Jaar op jaar (e-mails per maand)")
+                st.line_chart(year_over_year(LOGS_DIR, summary=summary))
     else:
         st.info("Geen trendgegevens beschikbaar.")
 
@@ -237,102 +327,102 @@ with tab_trends:
 # ⬇️ Export tab
 # --------------------
 with tab_export:
-    if not df.empty:
-        excel_buffer = BytesIO()
-        df.to_excel(excel_buffer, index=False)
-        st.download_button("⬇️ Download Excel", excel_buffer.getvalue(), "emails.xlsx")
+    if not cube.empty:
+        if st.button("⬇️ Genereer Excel-export"):
+            raw_df = load_raw_logs()
+            with phase("Excel-export", rows=len(raw_df)):
+                export_df = with_text(raw_df, range(len(raw_df)), log_files)
+                excel_bytes = build_excel_export(export_df)
+            st.download_button("⬇️ Download Excel", excel_bytes, "emails.xlsx", mime=EXCEL_MIME)
 
         if st.button("⬇️ Genereer PDF-rapport"):
-            pdf = FPDF()
-            pdf.add_page()
-            logo_path = os.path.join(BASE_DIR, "Streamlit-dashboard", "assets", "mailmind_logo.png")
-            if os.path.exists(logo_path):
-                pdf.image(logo_path, x=10, y=8, w=25)
-            pdf.set_font("Arial", "B", 16)
-            pdf.cell(200, 10, "MailMind Rapport", ln=True, align="C")
-
-            pdf.set_font("Arial", "", 12)
-            pdf.cell(200, 10, f"Datum: {datetime.now().strftime('%Y-%m-%d')}", ln=True)
-            pdf.ln(10)
-            pdf.cell(200, 10, f"Totaal e-mails: {total_mails}", ln=True)
-            pdf.cell(200, 10, f"AI beantwoord: {ai_count} ({answered_pct:.0f}%)", ln=True)
-            pdf.cell(200, 10, f"Fallbacks: {fallback_count} ({fallback_pct:.0f}%)", ln=True)
-            pdf.cell(200, 10, f"Klachten: {complaints_count}", ln=True)
-
-            pdf_buffer = BytesIO()
-            pdf.output(pdf_buffer)
-            st.download_button("⬇️ Download PDF", pdf_buffer.getvalue(), "rapport.pdf")
+            with phase("PDF-rapport"):
+                pdf_bytes = build_pdf_report(metrics, logo_path=LOGO_PATH)
+            st.download_button("⬇️ Download PDF", pdf_bytes, "rapport.pdf")
 
         if st.button("⬇️ Download grafieken (PNG)"):
-            tmpdir = tempfile.mkdtemp()
-            figs = {
-                "categorie.png": df["Categorie"].value_counts().plot(kind="bar").get_figure(),
-                "ai_vs_fallback.png": pd.Series({"AI": ai_count, "Fallback": fallback_count}).plot(kind="bar").get_figure(),
+            pngs = {
+                "categorie.png": chart_png(count_by(cube, "Categorie"), "bar", ""),
+                "ai_vs_fallback.png": chart_png(pd.Series({"AI": ai_count, "Fallback": fallback_count}), "bar", ""),
             }
-            zip_path = os.path.join(tmpdir, "grafieken.zip")
-            with zipfile.ZipFile(zip_path, "w") as zf:
-                for name, fig in figs.items():
-                    buf = BytesIO()
-                    fig.savefig(buf, format="png")
-                    zf.writestr(name, buf.getvalue())
-            with open(zip_path, "rb") as f:
-                st.download_button("⬇️ Download ZIP", f.read(), "grafieken.zip")
+            with phase("PNG-zip"):
+                zip_buffer = BytesIO()
+                with zipfile.ZipFile(zip_buffer, "w") as zf:
+                    for name, png in pngs.items():
+                        zf.writestr(name, png)
+            st.download_button("⬇️ Download ZIP", zip_buffer.getvalue(), "grafieken.zip")
     else:
         st.info("Geen data om te exporteren.")
 
 # --------------------
 # 📧 Automatische mailfunctie
 # --------------------
-def send_report_via_email():
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 16)
-    pdf.cell(200, 10, "MailMind Rapport", ln=True, align="C")
-
-    pdf.set_font("Arial", "", 12)
-    pdf.cell(200, 10, f"Datum: {datetime.now().strftime('%Y-%m-%d')}", ln=True)
-    pdf.ln(10)
-    pdf.cell(200, 10, f"Totaal e-mails: {total_mails}", ln=True)
-    pdf.cell(200, 10, f"AI beantwoord: {ai_count} ({answered_pct:.0f}%)", ln=True)
-    pdf.cell(200, 10, f"Fallbacks: {fallback_count} ({fallback_pct:.0f}%)", ln=True)
-    pdf.cell(200, 10, f"Klachten: {complaints_count}", ln=True)
-
-    pdf_buffer = BytesIO()
-    pdf.output(pdf_buffer)
-
-    msg = MIMEMultipart()
-    msg["From"] = os.getenv("SMTP_USER")
-    msg["To"] = os.getenv("REPORT_EMAIL")
-    msg["Subject"] = f"MailMind Rapport - {datetime.now().strftime('%Y-%m-%d')}"
-
-    body = MIMEText("Beste manager,\n\nIn de bijlage vindt u het dagelijkse MailMind rapport.\n\nGroeten,\nMailMind", "plain")
-    msg.attach(body)
-
-    attachment = MIMEApplication(pdf_buffer.getvalue(), _subtype="pdf")
-    attachment.add_header("Content-Disposition", "attachment", filename="rapport.pdf")
-    msg.attach(attachment)
-
-    try:
-        with smtplib.SMTP(os.getenv("SMTP_SERVER"), int(os.getenv("SMTP_PORT"))) as server:
-            server.starttls()
-            server.login(os.getenv("SMTP_USER"), os.getenv("SMTP_PASS"))
-            server.sendmail(msg["From"], msg["To"], msg.as_string())
-        print("✅ Rapport gemaild naar manager")
-    except Exception as e:
-        print("❌ Fout bij mailen rapport:", e)
-
-schedule.every().day.at("08:00").do(send_report_via_email)
-
-def run_scheduler():
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
-
-threading.Thread(target=run_scheduler, daemon=True).start()
+# Eén worker per proces, hoe vaak dit script ook opnieuw wordt uitgevoerd
+if os.getenv("MAILMIND_REPORT_WORKER", "1") != "0":
+    start_report_worker(LOGS_DIR, logo_path=LOGO_PATH)
 
 # --------------------
 # ⚙️ Config tab
 # --------------------
+perf_run = finish_run()
+if profiler is not None:
+    profiler.disable()
+    profile_text = io.StringIO()
+    pstats.Stats(profiler, stream=profile_text).sort_stats("cumulative").print_stats(40)
+    st.session_state["profile_report"] = profile_text.getvalue()
+    st.session_state["profile_stats"] = marshal.dumps(profiler.stats)
+
 with tab_config:
     st.subheader("⚙️ Configuratie")
     st.markdown("Hier kun je later instellingen beheren (bijvoorbeeld logo uploaden, kleuren aanpassen, alerts instellen).")
+
+    st.markdown("#### 🧠 Gedeelde datastore")
+    store_info = get_store().info()
+    col_mem, col_items, col_hits, col_misses, col_evictions = st.columns(5)
+    col_mem.metric("Geheugen", f"{store_info['used_mb']:.0f} / {store_info['budget_mb']:.0f} MB")
+    col_items.metric("Items", store_info["items"])
+    col_hits.metric("Hits", store_info["hits"])
+    col_misses.metric("Misses", store_info["misses"])
+    col_evictions.metric("Evictions", store_info["evictions"])
+
+    st.markdown("#### 🚫 Logbestanden en quarantaine")
+    log_index = get_log_index(LOGS_DIR)
+    manifest = load_manifest(log_index.all_files())
+    status_counts = manifest["Status"].value_counts()
+    st.caption(" • ".join(f"{status}: {count}" for status, count in status_counts.items())
+               + f" • lockbestanden genegeerd: {len(log_index.lock_files)}")
+    problem_files = manifest[~manifest["Status"].isin(["ok", "onbekend"])]
+    if not problem_files.empty:
+        st.dataframe(problem_files, hide_index=True, use_container_width=True)
+    st.caption("Bestanden met status fout of schema worden overgeslagen tot ze gewijzigd zijn.")
+
+    st.markdown("#### ⏱️ Prestaties van deze rerun")
+    st.caption(f"Totaal {perf_run.total_seconds * 1000:.0f} ms • {perf_run.started_at:%H:%M:%S}")
+    if perf_run.phases:
+        perf_df = pd.DataFrame(perf_run.phases)
+        perf_df["fase"] = ["\u2003" * level + name for level, name in zip(perf_df["niveau"], perf_df["fase"])]
+        perf_df["ms"] = (perf_df["seconden"] * 1000).round(1)
+        perf_df["rijen"] = perf_df["rijen"].astype("Int64")
+        st.dataframe(perf_df[["fase", "ms", "rijen"]].rename(columns={"fase": "Fase", "rijen": "Rijen"}),
+                     hide_index=True, use_container_width=True)
+        st.caption("Bestanden worden parallel ingelezen; hun tijden tellen niet op tot het totaal.")
+
+    cache_cols = st.columns(len(perf_run.counters))
+    for col, (cache, counters) in zip(cache_cols, perf_run.counters.items()):
+        rate = hit_rate(counters)
+        col.metric(f"Hit rate {cache}", "–" if rate is None else f"{rate:.0%}",
+                   help=f"{counters.get('hits', 0)} hits • {counters.get('misses', 0)} misses • "
+                        f"{counters.get('evictions', 0)} evictions")
+
+    if METRICS_LOG:
+        st.caption(f"📝 Metingen per rerun worden bijgeschreven in `{METRICS_LOG}`.")
+    else:
+        st.caption("📝 Zet MAILMIND_METRICS_LOG om de metingen per rerun in een roterend logbestand te bewaren.")
+
+    if st.button("🧪 Profileer de volgende rerun (cProfile)"):
+        st.session_state["profile_next_run"] = True
+        st.rerun()
+    if "profile_report" in st.session_state:
+        with st.expander("📋 Laatste profiel"):
+            st.code(st.session_state["profile_report"])
+            st.download_button("⬇️ Download .prof", st.session_state["profile_stats"], "dashboard.prof")
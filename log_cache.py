@@ -0,0 +1,254 @@
+# 📂 log_cache.py
+# Kolomgebaseerde cache naast de dagelijkse mail_log_*.xlsx bestanden.
+# Elk logbestand wordt één keer met openpyxl ingelezen en daarna als Parquet
+# (of pickle als pyarrow ontbreekt) bewaard in logs/.cache/. De cachenaam bevat
+# mtime en grootte van het bronbestand, zodat een gewijzigde dag vanzelf opnieuw
+# wordt ingelezen en ongewijzigde dagen nooit meer via Excel lopen.
+# Per bestand en versie wordt ook een status bijgehouden (manifest): kapotte
+# bestanden of bestanden zonder de vereiste kolommen worden tot ze veranderen
+# direct overgeslagen in plaats van bij elke rerun opnieuw geprobeerd.
+
+import os
+import re
+import json
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_EXT = ".parquet"
+except ImportError:
+    CACHE_EXT = ".pkl"
+
+CACHE_DIR_NAME = ".cache"
+STATUS_EXT = ".status.json"
+
+# Zonder deze kolommen is een log niet te verwerken; de verwachte kolommen
+# worden bij ontbreken aangevuld (Beantwoord = "Nee"), maar wel gemeld.
+REQUIRED_COLUMNS = ("Tijdstip", "Categorie")
+EXPECTED_COLUMNS = ("Afzender", "Beantwoord")
+
+STATUS_OK = "ok"
+STATUS_INCOMPLETE = "onvolledig"
+STATUS_FAILED = "fout"
+STATUS_SCHEMA = "schema"
+QUARANTINE_STATUSES = (STATUS_FAILED, STATUS_SCHEMA)
+
+
+class QuarantinedLog(Exception):
+    def __init__(self, path, status, detail):
+        super().__init__(f"{os.path.basename(path)}: {status} ({detail})")
+        self.path = path
+        self.status = status
+        self.detail = detail
+
+
+def cache_dir_for(path):
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def data_version(paths):
+    """Sleutel die verandert zodra een van de bestanden wordt toegevoegd, verwijderd of gewijzigd."""
+    version = []
+    for path in sorted(paths, key=os.path.basename):
+        try:
+            version.append((os.path.basename(path),) + file_signature(path))
+        except OSError:
+            continue
+    return tuple(version)
+
+
+def cache_path(path, signature, kind="", ext=CACHE_EXT):
+    """Cachebestand voor deze versie (mtime, grootte) van path en soort afgeleide tabel."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    mtime_ns, size = signature
+    return os.path.join(cache_dir_for(path), f"{stem}.{mtime_ns}-{size}{kind}{ext}")
+
+
+def read_frame(frame_path):
+    if CACHE_EXT == ".parquet":
+        return pd.read_parquet(frame_path)
+    return pd.read_pickle(frame_path)
+
+
+def _arrow_safe(df):
+    # Excel levert soms gemengde kolommen op (bijv. True naast "Ja"); Parquet
+    # wil één type per kolom, dus niet-lege waarden worden dan tekst.
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        values = df[col]
+        if values.dropna().map(type).nunique() > 1:
+            df[col] = values.where(values.isna(), values.astype(str))
+    return df
+
+
+def temp_path(path):
+    """Tijdelijke naam naast path, uniek per proces én thread (Streamlit-sessies zijn threads)."""
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+
+def remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def write_frame(df, frame_path):
+    """Schrijf df naar de cache en geef het frame terug zoals het is opgeslagen."""
+    # Eerst naar een tijdelijk bestand schrijven en dan hernoemen, zodat een
+    # parallelle lezer nooit een half geschreven cachebestand ziet.
+    tmp_path = temp_path(frame_path)
+    try:
+        if CACHE_EXT == ".parquet":
+            try:
+                df.to_parquet(tmp_path, index=False)
+            except (TypeError, ValueError, pyarrow.ArrowException):
+                df = _arrow_safe(df)
+                df.to_parquet(tmp_path, index=False)
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, frame_path)
+        return df
+    finally:
+        remove_quietly(tmp_path)
+
+
+def drop_stale(path, keep, kind="", ext=CACHE_EXT):
+    """Verwijder oudere versies van hetzelfde soort cachebestand voor path, behalve keep."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    pattern = re.compile(rf"{re.escape(stem)}\.\d+-\d+{re.escape(kind)}{re.escape(ext)}")
+    cache_dir = cache_dir_for(path)
+    for name in os.listdir(cache_dir):
+        old = os.path.join(cache_dir, name)
+        if old != keep and pattern.fullmatch(name):
+            remove_quietly(old)
+
+
+def cached_frame(path, kind, build):
+    """Geef build(path) terug, gecachet per bronbestand en soort afgeleide tabel."""
+    signature = file_signature(path)
+    frame_path = cache_path(path, signature, kind)
+
+    if os.path.exists(frame_path):
+        try:
+            return read_frame(frame_path)
+        except Exception:
+            pass
+
+    df = build(path)
+
+    try:
+        os.makedirs(cache_dir_for(path), exist_ok=True)
+        # Het opgeslagen frame teruggeven (met bijv. gemengde kolommen als tekst),
+        # zodat de eerste keer inlezen hetzelfde oplevert als elke keer daarna
+        df = write_frame(df, frame_path)
+        drop_stale(path, frame_path, kind)
+    except Exception:
+        # Cache is een optimalisatie: een onschrijfbare map of een kolom die
+        # Parquet niet aankan mag het inladen nooit blokkeren.
+        pass
+
+    return df
+
+
+def _status_path(path, signature):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    mtime_ns, size = signature
+    return os.path.join(cache_dir_for(path), f"{stem}.{mtime_ns}-{size}{STATUS_EXT}")
+
+
+def read_status(path, signature=None):
+    """Opgeslagen status van deze versie van het bestand, of None als die nog onbekend is."""
+    signature = signature or file_signature(path)
+    try:
+        with open(_status_path(path, signature), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_status(path, signature, status, detail=""):
+    # Eén klein bestand per log en versie: parallelle workers zitten elkaar
+    # zo niet in de weg zoals bij één gedeeld manifestbestand.
+    status_path = _status_path(path, signature)
+    tmp_path = temp_path(status_path)
+    try:
+        os.makedirs(cache_dir_for(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"status": status, "detail": detail,
+                       "gecontroleerd": datetime.now().isoformat(timespec="seconds")}, f)
+        os.replace(tmp_path, status_path)
+        drop_stale(path, status_path, ext=STATUS_EXT)
+    except OSError:
+        pass
+    finally:
+        remove_quietly(tmp_path)
+
+
+def read_log(path):
+    """Lees één logbestand, bij voorkeur uit de cache; valt terug op pd.read_excel.
+
+    Bestanden die eerder niet te lezen waren of vereiste kolommen missen geven
+    direct QuarantinedLog, totdat mtime of grootte verandert.
+    """
+    signature = file_signature(path)
+    status = read_status(path, signature)
+    if status is not None and status["status"] in QUARANTINE_STATUSES:
+        raise QuarantinedLog(path, status["status"], status["detail"])
+
+    try:
+        df = cached_frame(path, "", pd.read_excel)
+    except Exception as e:
+        _write_status(path, signature, STATUS_FAILED, f"{type(e).__name__}: {e}")
+        raise QuarantinedLog(path, STATUS_FAILED, f"{type(e).__name__}: {e}") from e
+
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        detail = "ontbrekende kolommen: " + ", ".join(missing)
+        _write_status(path, signature, STATUS_SCHEMA, detail)
+        raise QuarantinedLog(path, STATUS_SCHEMA, detail)
+
+    if status is None:
+        incomplete = [c for c in EXPECTED_COLUMNS if c not in df.columns]
+        if incomplete:
+            _write_status(path, signature, STATUS_INCOMPLETE, "aangevulde kolommen: " + ", ".join(incomplete))
+        else:
+            _write_status(path, signature, STATUS_OK)
+    return df
+
+
+def check_log(path):
+    """QuarantinedLog als deze versie van het bestand niet bruikbaar is; valideert zo nodig eerst."""
+    status = read_status(path)
+    if status is None:
+        read_log(path)
+    elif status["status"] in QUARANTINE_STATUSES:
+        raise QuarantinedLog(path, status["status"], status["detail"])
+
+
+def load_manifest(log_files):
+    """Status per logbestand (ok, onvolledig, fout, schema of nog onbekend)."""
+    rows = []
+    for path in sorted(log_files, key=os.path.basename):
+        try:
+            signature = file_signature(path)
+        except OSError:
+            continue
+        status = read_status(path, signature) or {"status": "onbekend", "detail": "", "gecontroleerd": None}
+        rows.append({
+            "Bestand": os.path.basename(path),
+            "Status": status["status"],
+            "Detail": status["detail"],
+            "Gecontroleerd": status["gecontroleerd"],
+            "Grootte": signature[1],
+            "Gewijzigd": datetime.fromtimestamp(signature[0] / 1e9).strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    return pd.DataFrame(rows, columns=["Bestand", "Status", "Detail", "Gecontroleerd", "Grootte", "Gewijzigd"])
@@ -0,0 +1,71 @@
+# 📂 log_charts.py
+# PNG-cache voor de matplotlib-grafieken.
+# Een grafiek wordt alleen getekend als de geaggregeerde reeks (of de opmaak)
+# verandert: de sleutel is een hash van index, waarden en plotopties. Figuren
+# worden buiten de globale pyplot-state om gemaakt (matplotlib.figure.Figure)
+# en direct na het opslaan als PNG opgeruimd, zodat er niets blijft hangen.
+# Dezelfde bytes dienen voor weergave én download.
+
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+from log_perf import record
+
+CHART_CACHE_SIZE = int(os.getenv("MAILMIND_CHART_CACHE_SIZE", "64"))
+CHART_DPI = 150
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def chart_key(series, kind, title, **plot_kwargs):
+    digest = hashlib.sha1()
+    digest.update(repr((kind, title, sorted(plot_kwargs.items()))).encode())
+    digest.update(pd.util.hash_pandas_object(series, index=True).to_numpy().tobytes())
+    digest.update(repr(list(series.index)).encode())
+    return digest.hexdigest()
+
+
+def _render(series, kind, title, figsize=None, ylabel=None, **plot_kwargs):
+    fig = Figure(figsize=figsize)
+    try:
+        ax = fig.subplots()
+        series.plot(kind=kind, ax=ax, **plot_kwargs)
+        ax.set_title(title)
+        if ylabel is not None:
+            ax.set_ylabel(ylabel)
+        buf = BytesIO()
+        fig.savefig(buf, format="png", bbox_inches="tight", dpi=CHART_DPI)
+        return buf.getvalue()
+    finally:
+        fig.clear()
+
+
+def chart_png(series, kind, title, figsize=None, ylabel=None, **plot_kwargs):
+    """PNG-bytes van de grafiek; uit de cache als dezelfde reeks al eens getekend is."""
+    key = chart_key(series, kind, title, figsize=figsize, ylabel=ylabel, **plot_kwargs)
+    with _lock:
+        png = _cache.get(key)
+        if png is not None:
+            _cache.move_to_end(key)
+            stats["hits"] += 1
+            return png
+        stats["misses"] += 1
+
+    start = time.perf_counter()
+    png = _render(series, kind, title, figsize=figsize, ylabel=ylabel, **plot_kwargs)
+    record(f"grafiek {title or kind}", time.perf_counter() - start, len(series))
+    with _lock:
+        _cache[key] = png
+        while len(_cache) > CHART_CACHE_SIZE:
+            _cache.popitem(last=False)
+            stats["evictions"] += 1
+    return png
@@ -0,0 +1,104 @@
+# 📂 log_cube.py
+# Voorgeaggregeerde telkubus per logbestand.
+# Elke dag wordt één keer samengevat tot aantallen per
+# (Datum, Uur, Categorie, Afzender, Beantwoord, Reden, HeeftAntwoord) en naast de
+# ruwe cache bewaard. Statistieken, Grafieken en Trends beantwoorden elke
+# filtercombinatie door de kubus te slicen en "Aantal" op te tellen; de ruwe
+# regels zijn alleen nog nodig voor de logtabel en de Excel-export.
+
+import os
+import pandas as pd
+
+from log_cache import cached_frame, check_log, read_log
+from log_loader import has_answer, load_frames, normalize_logs
+
+CUBE_KIND = ".cube"
+CUBE_KEYS = ["Datum", "Uur", "Categorie", "Afzender", "Beantwoord", "Reden", "HeeftAntwoord"]
+CUBE_COLUMNS = ["Bestand"] + CUBE_KEYS + ["Aantal"]
+
+
+def build_cube(df):
+    """Tel een (ruw) logframe samen tot kubusrijen."""
+    if df.empty:
+        return pd.DataFrame(columns=CUBE_KEYS + ["Aantal"])
+
+    df = normalize_logs(df.copy())
+    if "Afzender" not in df.columns:
+        df["Afzender"] = None
+    if "Antwoord" in df.columns:
+        heeft_antwoord = has_answer(df["Antwoord"])
+    else:
+        heeft_antwoord = pd.Series(False, index=df.index)
+
+    keys = pd.DataFrame({
+        "Datum": df["Tijdstip"].dt.normalize(),
+        "Uur": df["Uur"].astype("Int64"),
+        "Categorie": df["Categorie"].astype(str),
+        "Afzender": df["Afzender"],
+        "Beantwoord": df["Beantwoord"].astype(str),
+        "Reden": df["Reden"],
+        "HeeftAntwoord": heeft_antwoord,
+    })
+    return keys.groupby(CUBE_KEYS, dropna=False).size().rename("Aantal").reset_index()
+
+
+def _build_file_cube(path):
+    return build_cube(read_log(path))
+
+
+def _read_cube(path):
+    try:
+        # Ook bij een kubus uit de cache: quarantaine en status eerst
+        check_log(path)
+        cube = cached_frame(path, CUBE_KIND, _build_file_cube)
+    except Exception:
+        return None
+    cube.insert(0, "Bestand", os.path.basename(path))
+    return cube
+
+
+def load_cube(log_files, workers=None):
+    """Kubus voor de gegeven logbestanden; alleen gewijzigde dagen worden opnieuw geteld.
+
+    De kubus per dag staat in de gedeelde store (per bestand, mtime en grootte);
+    de kubus van een periode wordt daar per aanroep uit samengevoegd.
+    """
+    cube = load_frames(log_files, _read_cube, workers)
+    return cube if not cube.empty else pd.DataFrame(columns=CUBE_COLUMNS)
+
+
+def slice_cube(cube, categories=None, senders=None, reasons=None):
+    """Beperk de kubus tot de gekozen filters (lege selectie = geen filter)."""
+    mask = pd.Series(True, index=cube.index)
+    if categories:
+        mask &= cube["Categorie"].isin(categories)
+    if senders:
+        mask &= cube["Afzender"].isin(senders)
+    if reasons:
+        mask &= cube["Reden"].isin(reasons)
+    return cube[mask]
+
+
+def count_by(cube, column):
+    """Equivalent van df[column].value_counts() op de ruwe regels."""
+    counts = cube.groupby(column)["Aantal"].sum()
+    counts = counts[counts > 0].sort_values(ascending=False, kind="stable")
+    counts.name = "count"
+    return counts
+
+
+def cube_metrics(cube):
+    """Kerncijfers zoals de Statistieken-tab ze toont."""
+    total = int(cube["Aantal"].sum())
+    answered = int(cube.loc[cube["Beantwoord"] == "Ja", "Aantal"].sum())
+    complaints = int(cube.loc[cube["Categorie"].str.contains("klacht", case=False, na=False), "Aantal"].sum())
+    fallbacks = int(cube.loc[cube["Reden"].fillna("").astype(str).str.strip() != "", "Aantal"].sum())
+    return {
+        "total": total,
+        "unique_senders": cube.loc[cube["Aantal"] > 0, "Afzender"].nunique(),
+        "answered": answered,
+        "answered_pct": (answered / total * 100) if total > 0 else 0,
+        "complaints": complaints,
+        "fallbacks": fallbacks,
+        "fallback_pct": (fallbacks / total * 100) if total > 0 else 0,
+    }
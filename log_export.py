@@ -0,0 +1,75 @@
+# 📂 log_export.py
+# Excel-export van (gefilterde) logregels.
+# xlsxwriter draait in constant_memory-modus: rijen worden in blokken omgezet en
+# direct weggeschreven, zodat het geheugen niet meegroeit met het aantal rijen.
+# Kolombreedtes komen uit gevectoriseerde stringlengtes en de groen/rood-kleuring
+# van "Beantwoord" is één voorwaardelijke opmaak op sheetniveau in plaats van
+# een write per cel.
+
+import os
+import tempfile
+
+import xlsxwriter
+
+EXCEL_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_CHUNK_ROWS = 10_000
+MAX_COLUMN_WIDTH = 80
+
+
+def column_widths(df):
+    widths = []
+    for col in df.columns:
+        lengths = df[col].astype(str).str.len()
+        longest = int(lengths.max()) if len(lengths) else 0
+        widths.append(min(max(longest, len(str(col))) + 2, MAX_COLUMN_WIDTH))
+    return widths
+
+
+def _rows(df):
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def build_excel_export(df, sheet_name="Log"):
+    """Bouw het exportbestand en geef de bytes terug."""
+    # constant_memory schrijft via tijdelijke bestanden; de workbook zelf
+    # gaat naar een tijdelijk .xlsx dat we na afloop inlezen.
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        workbook = xlsxwriter.Workbook(path, {
+            "constant_memory": True,
+            "default_date_format": "yyyy-mm-dd hh:mm:ss",
+            "nan_inf_to_errors": True,
+            "strings_to_urls": False,
+            "strings_to_formulas": False,
+        })
+        worksheet = workbook.add_worksheet(sheet_name)
+        header_format = workbook.add_format({"bold": True, "bg_color": "#D9E1F2", "border": 1})
+        green_fill = workbook.add_format({"bg_color": "#C6EFCE"})
+        red_fill = workbook.add_format({"bg_color": "#FFC7CE"})
+
+        for col_num, width in enumerate(column_widths(df)):
+            worksheet.set_column(col_num, col_num, width)
+        worksheet.write_row(0, 0, [str(c) for c in df.columns], header_format)
+
+        for row_num, values in enumerate(_rows(df), start=1):
+            worksheet.write_row(row_num, 0, values)
+
+        if "Beantwoord" in df.columns and len(df):
+            antwoord_idx = df.columns.get_loc("Beantwoord")
+            worksheet.conditional_format(1, antwoord_idx, len(df), antwoord_idx, {
+                "type": "cell", "criteria": "==", "value": '"Ja"', "format": green_fill,
+            })
+            worksheet.conditional_format(1, antwoord_idx, len(df), antwoord_idx, {
+                "type": "cell", "criteria": "!=", "value": '"Ja"', "format": red_fill,
+            })
+
+        workbook.close()
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
@@ -0,0 +1,151 @@
+# 📂 log_filters.py
+# Filterengine voor de multiselects op Categorie, Afzender en Reden.
+# Per kolom worden de waarden één keer naar categoriecodes omgezet en gesorteerd;
+# per gekozen waarde ontstaat zo een (gepakte) bitmap van rijen. Selecties binnen
+# een kolom worden ge-OR'd en tussen kolommen ge-AND'd. Het resultaat zijn
+# rijposities, zodat er geen kopie van het hele frame meer nodig is.
+
+import heapq
+import threading
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+import pandas as pd
+
+FILTER_COLUMNS = ("Categorie", "Afzender", "Reden")
+SENDER_OPTIONS_LIMIT = 50
+
+
+class FilterEngine:
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self._columns = {}
+        self._bitmaps = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col])
+            codes = codes.astype(np.int32)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            lookup = {value: i for i, value in enumerate(uniques)}
+            self._columns[col] = (order, bounds, lookup)
+
+    def _bitmap(self, col, code):
+        key = (col, code)
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            order, bounds, _ = self._columns[col]
+            bits = np.zeros(self.n_rows, dtype=bool)
+            bits[order[bounds[code]:bounds[code + 1]]] = True
+            bitmap = np.packbits(bits)
+            self._bitmaps[key] = bitmap
+        return bitmap
+
+    def mask(self, **selections):
+        """Gepakte bitmap van rijen die aan alle (niet-lege) selecties voldoen, of None."""
+        result = None
+        for col, selected in selections.items():
+            if not selected:
+                continue
+            lookup = self._columns[col][2] if col in self._columns else {}
+            col_bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+            for value in selected:
+                code = lookup.get(value)
+                if code is not None:
+                    np.bitwise_or(col_bits, self._bitmap(col, code), out=col_bits)
+            result = col_bits if result is None else np.bitwise_and(result, col_bits, out=result)
+        return result
+
+    def rows(self, **selections):
+        """Rijposities (oplopend) die aan de selecties voldoen."""
+        packed = self.mask(**selections)
+        if packed is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(np.unpackbits(packed, count=self.n_rows))
+
+
+class SenderIndex:
+    """Zoekindex over afzenders: prefix via bisect, deelstrings via trigrammen, gesorteerd op volume."""
+
+    def __init__(self, volumes):
+        volumes = volumes[volumes > 0].sort_values(ascending=False, kind="stable")
+        self._senders = [str(s) for s in volumes.index]
+        self._lower = [s.lower() for s in self._senders]
+        # Rang = positie in de volumelijst; een kleinere rang betekent meer mails
+        self._prefix_keys = sorted((key, rank) for rank, key in enumerate(self._lower))
+        trigrams = defaultdict(set)
+        for rank, key in enumerate(self._lower):
+            for i in range(len(key) - 2):
+                trigrams[key[i:i + 3]].add(rank)
+        self._trigrams = dict(trigrams)
+
+    def __len__(self):
+        return len(self._senders)
+
+    def _prefix_ranks(self, query):
+        start = bisect_left(self._prefix_keys, (query,))
+        for key, rank in self._prefix_keys[start:]:
+            if not key.startswith(query):
+                break
+            yield rank
+
+    def _substring_ranks(self, query):
+        if len(query) < 3:
+            return set()
+        postings = []
+        for i in range(len(query) - 2):
+            posting = self._trigrams.get(query[i:i + 3])
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set.intersection(*postings)
+        return {rank for rank in candidates if query in self._lower[rank]}
+
+    def search(self, query="", limit=SENDER_OPTIONS_LIMIT):
+        """Maximaal `limit` afzenders die met de zoekterm beginnen of die bevatten, drukste eerst."""
+        query = (query or "").strip().lower()
+        if not query:
+            return self._senders[:limit]
+        ranks = set(self._prefix_ranks(query)) | self._substring_ranks(query)
+        return [self._senders[rank] for rank in heapq.nsmallest(limit, ranks)]
+
+
+_engines = OrderedDict()
+_engines_lock = threading.Lock()
+MAX_ENGINES = 8
+
+
+def get_filter_engine(version, df):
+    """Eén engine per dataversie, gedeeld over reruns heen."""
+    with _engines_lock:
+        engine = _engines.get(version)
+        if engine is not None:
+            _engines.move_to_end(version)
+            return engine
+    engine = FilterEngine(df)
+    with _engines_lock:
+        _engines[version] = engine
+        while len(_engines) > MAX_ENGINES:
+            _engines.popitem(last=False)
+    return engine
+
+
+_sender_indexes = OrderedDict()
+
+
+def get_sender_index(version, cube):
+    """Afzenderindex per dataversie, opgebouwd uit de telkubus en bewaard over reruns heen."""
+    with _engines_lock:
+        index = _sender_indexes.get(version)
+        if index is not None:
+            _sender_indexes.move_to_end(version)
+            return index
+    index = SenderIndex(cube.groupby("Afzender")["Aantal"].sum())
+    with _engines_lock:
+        _sender_indexes[version] = index
+        while len(_sender_indexes) > MAX_ENGINES:
+            _sender_indexes.popitem(last=False)
+    return index
@@ -0,0 +1,167 @@
+# 📂 log_generator.py
+# Synthetische mail_log_YYYY-MM-DD.xlsx bestanden voor load- en benchmarktests.
+# Kolommen en waarden volgen de echte logs (Onderwerp, Afzender, Categorie,
+# Beantwoord, Antwoord, Reden, ...). Optioneel komen er Excel-lockbestanden
+# (~$mail_log_*.xlsx) en kapotte logbestanden bij, zoals ze ook in logs/ staan.
+# De bestanden worden met xlsxwriter in constant_memory-modus geschreven, zodat
+# ook 100k rijen per dag snel en zonder veel geheugen gaan.
+#
+#   python log_generator.py --out /tmp/mm_logs --dagen 365 --rijen 5000
+
+import os
+import argparse
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import xlsxwriter
+
+COLUMNS = [
+    "Onderwerp", "Afzender", "Inhoud", "Categorie", "Antwoord", "Tijdstip",
+    "Beantwoord", "Handmatig opvolgen", "Automatisch afgehandeld", "Hergebruikt antwoord", "Reden",
+]
+
+CATEGORIES = {
+    "Intern verzoek / Actie voor medewerker": ("Kun jij dit even regelen?", 14),
+    "Overig": ("Vraag", 12),
+    "Retour / Terugbetaling": ("Retour status", 11),
+    "Productinformatie": ("Vraag over product", 8),
+    "Planning / Afspraak": ("Demo inplannen", 7),
+    "Bestelling / Levering": ("Waar blijft mijn bestelling?", 7),
+    "Openingstijden / Locatie": ("Wat zijn jullie openingstijden?", 6),
+    "Klacht": ("Klacht over levering", 5),
+    "Inkoop / Bestellingen": ("Bestelverzoek", 5),
+    "Informatieaanvraag": ("Vragen over samenwerking", 5),
+    "Offerte / Prijsaanvraag": ("Offerte voor zakelijke samenwerking", 4),
+    "IT / Technisch probleem": ("Inloggen lukt niet", 3),
+    "Factuur / Administratie": ("Vraag over factuur", 3),
+}
+FALLBACK_REASONS = [
+    "Inkoop – Altijd fallback (bestelverzoek)",
+    "Geen passend antwoord gevonden",
+    "Lage zekerheid classificatie",
+    "Bijlage niet leesbaar",
+]
+DOMAINS = ["gmail.com", "outlook.com", "hotmail.com", "testbedrijf123.nl", "zohomail.eu", "ziggo.nl"]
+FIRST_NAMES = ["jan", "sanne", "bas", "lisa", "rens", "emma", "daan", "fleur", "tim", "noor", "kees", "anouk"]
+LAST_NAMES = ["devries", "jansen", "bakker", "visser", "smit", "meijer", "vanarkelen", "mulder", "bos", "dekker"]
+
+# Meer mail overdag dan 's nachts
+HOUR_WEIGHTS = np.array([1, 1, 1, 1, 1, 2, 3, 6, 10, 12, 12, 11, 9, 10, 11, 11, 10, 8, 6, 5, 4, 3, 2, 1], dtype=float)
+
+
+def sender_pool(n_senders, rng):
+    names = [
+        f"{rng.choice(FIRST_NAMES)}.{rng.choice(LAST_NAMES)}{i}@{rng.choice(DOMAINS)}"
+        for i in range(n_senders)
+    ]
+    # Een paar afzenders zijn veel drukker dan de rest (zoals in de echte logs)
+    weights = 1.0 / np.arange(1, n_senders + 1) ** 1.1
+    return np.array(names, dtype=object), weights / weights.sum()
+
+
+def day_rows(day, n_rows, senders, sender_weights, rng):
+    """Kolommen (als lijsten) voor één dag, gesorteerd op tijdstip."""
+    categories = list(CATEGORIES)
+    cat_weights = np.array([w for _, w in CATEGORIES.values()], dtype=float)
+    cat_idx = rng.choice(len(categories), n_rows, p=cat_weights / cat_weights.sum())
+
+    hours = rng.choice(24, n_rows, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+    seconds = np.sort(hours * 3600 + rng.integers(0, 3600, n_rows))
+    start = datetime.combine(day, datetime.min.time())
+    tijdstip = [(start + timedelta(seconds=int(s))).strftime("%Y-%m-%d %H:%M:%S") for s in seconds]
+
+    answered = rng.random(n_rows) < 0.62
+    fallback = ~answered & (rng.random(n_rows) < 0.05)
+    reused = answered & (rng.random(n_rows) < 0.08)
+    afzender = senders[rng.choice(len(senders), n_rows, p=sender_weights)]
+
+    onderwerp = [CATEGORIES[categories[i]][0] for i in cat_idx]
+    antwoord = [
+        f"Beste klant,\n\nBedankt voor uw bericht over '{onderwerp[i].lower()}'. "
+        f"Wij komen hier binnen twee werkdagen op terug.\n\nMet vriendelijke groet,\nMailMind"
+        if answered[i] else None
+        for i in range(n_rows)
+    ]
+    reasons = rng.choice(FALLBACK_REASONS, n_rows)
+    ja_nee = np.where(answered, "Ja", "Nee")
+    return {
+        "Onderwerp": onderwerp,
+        "Afzender": afzender.tolist(),
+        "Inhoud": [f"Goedendag,\n\n{o}\n\nGroet,\n{a.split('@')[0]}" for o, a in zip(onderwerp, afzender)],
+        "Categorie": [categories[i] for i in cat_idx],
+        "Antwoord": antwoord,
+        "Tijdstip": tijdstip,
+        "Beantwoord": ja_nee.tolist(),
+        "Handmatig opvolgen": np.where(answered, "Nee", "Ja").tolist(),
+        "Automatisch afgehandeld": ja_nee.tolist(),
+        "Hergebruikt antwoord": np.where(reused, "Ja", "Nee").tolist(),
+        "Reden": np.where(fallback, reasons, None).tolist(),
+    }
+
+
+def write_log(path, columns):
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "strings_to_urls": False})
+    worksheet = workbook.add_worksheet("Sheet1")
+    worksheet.write_row(0, 0, COLUMNS)
+    for row_num, values in enumerate(zip(*(columns[c] for c in COLUMNS)), start=1):
+        worksheet.write_row(row_num, 0, values)
+    workbook.close()
+
+
+def generate_logs(out_dir, start=None, days=30, rows_per_day=1000, n_senders=500,
+                  lock_files=0, corrupt_files=0, seed=42):
+    """Schrijf `days` dagelijkse logs naar out_dir en geef de paden terug.
+
+    Het aantal rijen varieert per dag rond rows_per_day (±25%, minder in het
+    weekend). Lock- en kapotte bestanden komen bovenop de gewone dagen.
+    """
+    rng = np.random.default_rng(seed)
+    start = start or date.today() - timedelta(days=days)
+    os.makedirs(out_dir, exist_ok=True)
+    senders, sender_weights = sender_pool(n_senders, rng)
+
+    paths = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        scale = 0.4 if day.weekday() >= 5 else 1.0
+        n_rows = max(1, int(rows_per_day * scale * rng.uniform(0.75, 1.25)))
+        path = os.path.join(out_dir, f"mail_log_{day.strftime('%Y-%m-%d')}.xlsx")
+        write_log(path, day_rows(day, n_rows, senders, sender_weights, rng))
+        paths.append(path)
+
+    for path in paths[:lock_files]:
+        # Excel laat een klein lockbestand naast een geopend werkboek achter
+        lock_path = os.path.join(out_dir, "~$" + os.path.basename(path))
+        with open(lock_path, "wb") as f:
+            f.write(rng.bytes(165))
+
+    for offset in range(corrupt_files):
+        day = start + timedelta(days=days + offset)
+        path = os.path.join(out_dir, f"mail_log_{day.strftime('%Y-%m-%d')}.xlsx")
+        with open(path, "wb") as f:
+            # Begint als een zip (xlsx), maar houdt halverwege op
+            f.write(b"PK\x03\x04" + rng.bytes(2048))
+
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetische MailMind-logs genereren")
+    parser.add_argument("--out", required=True, help="doelmap voor mail_log_*.xlsx")
+    parser.add_argument("--start", help="eerste dag (YYYY-MM-DD), standaard dagen geleden")
+    parser.add_argument("--dagen", type=int, default=30, help="aantal dagen")
+    parser.add_argument("--rijen", type=int, default=1000, help="gemiddeld aantal rijen per dag")
+    parser.add_argument("--afzenders", type=int, default=500, help="aantal verschillende afzenders")
+    parser.add_argument("--lock", type=int, default=0, help="aantal ~$ lockbestanden")
+    parser.add_argument("--kapot", type=int, default=0, help="aantal kapotte logbestanden")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start, "%Y-%m-%d").date() if args.start else None
+    paths = generate_logs(args.out, start, args.dagen, args.rijen, args.afzenders,
+                          args.lock, args.kapot, args.seed)
+    print(f"✅ {len(paths)} logbestanden geschreven naar {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# 📂 log_index.py
+# In-memory index van beschikbare logdagen in LOGS_DIR.
+# Eén directory-scan vult een gesorteerde lijst met datums; die wordt alleen
+# opnieuw opgebouwd als de mtime van de map verandert (bestand toegevoegd,
+# verwijderd of hernoemd). Periodes worden met bisect opgezocht, dus zonder
+# glob of os.path.exists per dag. Excel-lockbestanden (~$mail_log_*.xlsx)
+# vallen buiten het patroon en worden genegeerd.
+
+import os
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+
+LOG_NAME_RE = re.compile(r"^mail_log_(\d{4}-\d{2}-\d{2})\.xlsx$")
+
+
+class LogIndex:
+    def __init__(self, logs_dir):
+        self.logs_dir = logs_dir
+        self._dir_mtime = None
+        self._dates = []
+        self.lock_files = []
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Scan de map opnieuw, maar alleen als de mtime van de map veranderd is."""
+        try:
+            dir_mtime = os.stat(self.logs_dir).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+
+        with self._lock:
+            if dir_mtime == self._dir_mtime:
+                return False
+            dates = []
+            lock_files = []
+            if dir_mtime is not None:
+                with os.scandir(self.logs_dir) as entries:
+                    for entry in entries:
+                        match = LOG_NAME_RE.match(entry.name)
+                        if not match and entry.name.startswith("~$") and LOG_NAME_RE.match(entry.name[2:]):
+                            lock_files.append(entry.name)
+                        if not match or not entry.is_file():
+                            continue
+                        try:
+                            dates.append(datetime.strptime(match.group(1), "%Y-%m-%d").date())
+                        except ValueError:
+                            continue
+            self._dates = sorted(dates)
+            self.lock_files = sorted(lock_files)
+            self._dir_mtime = dir_mtime
+            return True
+
+    def path_for(self, day):
+        return os.path.join(self.logs_dir, f"mail_log_{day.strftime('%Y-%m-%d')}.xlsx")
+
+    def dates_between(self, start, end):
+        self.refresh()
+        dates = self._dates
+        return dates[bisect_left(dates, _as_date(start)):bisect_right(dates, _as_date(end))]
+
+    def files_between(self, start, end):
+        return [self.path_for(d) for d in self.dates_between(start, end)]
+
+    def all_dates(self):
+        self.refresh()
+        return list(self._dates)
+
+    def all_files(self):
+        return [self.path_for(d) for d in self.all_dates()]
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+def period_range(mode, ref_date):
+    """Begin- en einddatum (inclusief) van de periode rond ref_date."""
+    ref_date = _as_date(ref_date)
+    if mode == "Dag":
+        return ref_date, ref_date
+    if mode == "Week":
+        start = ref_date - timedelta(days=ref_date.weekday())
+        return start, start + timedelta(days=6)
+    if mode == "Maand":
+        start = ref_date.replace(day=1)
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        return start, next_month - timedelta(days=1)
+    raise ValueError(f"Onbekende weergave: {mode}")
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_log_index(logs_dir):
+    """Eén gedeelde index per logmap voor het hele proces (alle sessies)."""
+    key = os.path.abspath(logs_dir)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = LogIndex(key)
+        return _indexes[key]
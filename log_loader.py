@@ -0,0 +1,263 @@
+# 📂 log_loader.py
+# Laadt meerdere mail_log_*.xlsx bestanden tegelijk via een procespool.
+# Voor Week, Maand en het totaaloverzicht groeit de laadtijd zo niet meer
+# lineair met het aantal dagen. Het resultaat is één frame met kolom "Bestand",
+# altijd in dezelfde (chronologische) volgorde.
+# Voor de logtabel kunnen de vrije-tekstkolommen worden weggelaten en de rest
+# per dag naar zuinige dtypes worden omgezet; de tekst wordt dan per pagina opgehaald.
+
+import os
+import time
+import threading
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pandas.api.types import union_categoricals
+
+from log_cache import file_signature, read_log
+from log_perf import phase, record
+from log_store import get_store
+
+# Aantal workers; 0 of 1 betekent alles in het hoofdproces inlezen
+DEFAULT_WORKERS = int(os.getenv("MAILMIND_LOAD_WORKERS", os.cpu_count() or 1))
+
+# Vrije tekst: groot per rij en alleen nodig als iemand hem echt wil lezen
+TEXT_COLUMNS = ("Inhoud", "Antwoord")
+CATEGORY_COLUMNS = ("Categorie", "Afzender", "Beantwoord", "Reden", "Bestand")
+# Kolomvolgorde zoals in de mail_log_*.xlsx bestanden
+LOG_COLUMNS = (
+    "Onderwerp", "Afzender", "Inhoud", "Categorie", "Antwoord", "Tijdstip",
+    "Beantwoord", "Handmatig opvolgen", "Automatisch afgehandeld", "Hergebruikt antwoord", "Reden",
+)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _read_one(path, drop=()):
+    try:
+        df = read_log(path)
+    except Exception:
+        return None
+    if drop:
+        df = df.drop(columns=[c for c in drop if c in df.columns])
+    df["Bestand"] = os.path.basename(path)
+    return df
+
+
+def has_answer(values):
+    """True waar een (vrije-tekst)antwoord echt iets bevat."""
+    return values.notna() & (values.astype(str).str.strip() != "")
+
+
+def _read_compact(path, drop=TEXT_COLUMNS, answered_from_text=False):
+    # Eén dag meteen genormaliseerd en compact: de ruwe kopie met vrije tekst
+    # komt zo nooit in de store of in het samengevoegde frame.
+    df = _read_one(path)
+    if df is None:
+        return None
+    df = normalize_logs(df)
+    if answered_from_text and "Antwoord" in df.columns:
+        df.loc[has_answer(df["Antwoord"]), "Beantwoord"] = "Ja"
+    df = df.drop(columns=[c for c in drop if c in df.columns])
+    return compact_logs(df)
+
+
+def _timed(read, path):
+    start = time.perf_counter()
+    frame = read(path)
+    return frame, time.perf_counter() - start
+
+
+def _get_pool(workers):
+    # De pool blijft over Streamlit-reruns heen bestaan; opstarten kost meer
+    # dan het inlezen van een handvol gecachte dagen. Eén pool per aantal
+    # workers, nooit vervangen: een andere sessie kan er nog op aan het wachten zijn.
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pools[workers] = pool
+        return pool
+
+
+def load_frames(log_files, reader, workers=None, combine=True, store_days=True, **reader_kwargs):
+    """Pas reader toe op elk bestaand logbestand (parallel) en plak de resultaten aan elkaar.
+
+    Ingelezen dagen komen in de gedeelde store (per bestand, mtime en grootte);
+    alleen dagen die daar nog niet staan gaan naar de pool, en een oudere versie
+    van een gewijzigde dag verdwijnt meteen. Overlappende periodes (week, maand,
+    alles) delen zo dezelfde dagen en elke dag telt één keer mee voor het budget.
+    Het samengevoegde frame wordt per aanroep gemaakt en niet bewaard. Met
+    combine=False komt de lijst met (niet-lege) dagframes terug in plaats van één
+    frame; store_days=False is voor processen die niets hoeven te bewaren.
+    """
+    if workers is None:
+        workers = DEFAULT_WORKERS
+    options = tuple(sorted(reader_kwargs.items()))
+    read = partial(_timed, partial(reader, **reader_kwargs) if reader_kwargs else reader)
+    store = get_store()
+    keys = {}
+    for path in {p for p in log_files if os.path.exists(p)}:
+        try:
+            keys[path] = (reader.__module__, reader.__name__, options, path) + file_signature(path)
+        except OSError:
+            continue
+    paths = sorted(keys, key=os.path.basename)
+
+    loaded = {path: store.get(keys[path]) if store_days else None for path in paths}
+    missing = [path for path in paths if loaded[path] is None]
+    if workers > 1 and len(missing) > 1:
+        chunksize = max(1, len(missing) // (workers * 4))
+        results = list(_get_pool(workers).map(read, missing, chunksize=chunksize))
+    else:
+        results = [read(p) for p in missing]
+    for path, (frame, seconds) in zip(missing, results):
+        # Tijd per bestand zoals gemeten in de worker (parallel, dus niet op te tellen)
+        record(f"inlezen {os.path.basename(path)}", seconds, None if frame is None else len(frame))
+        if frame is not None and store_days:
+            frame = store.put(keys[path], frame)
+            store.discard_older(keys[path], version_len=2)
+        loaded[path] = frame
+
+    frames = [loaded[p] for p in paths]
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not combine:
+        return frames
+    with phase("samenvoegen") as info:
+        df = concat_frames(frames)
+        info["rows"] = len(df)
+    return df
+
+
+def load_logs(log_files, workers=None, drop=(), store_days=True):
+    """Lees alle bestaande logbestanden in en plak ze aan elkaar, gesorteerd op bestandsnaam.
+
+    Kolommen in `drop` (bijv. TEXT_COLUMNS) worden al per dag weggelaten.
+    """
+    return load_frames(log_files, _read_one, workers, store_days=store_days,
+                       **({"drop": tuple(drop)} if drop else {}))
+
+
+def load_compact_logs(log_files, workers=None, answered_from_text=False):
+    """Genormaliseerde, compacte regels zonder vrije tekst, per dag omgezet.
+
+    Met answered_from_text telt een ingevuld Antwoord als beantwoord (regel van
+    app.py); het antwoord zelf wordt daarna toch weggelaten. Alleen de compacte
+    dagen staan in de store; het samengevoegde frame is per aanroep nieuw.
+    """
+    df = load_frames(log_files, _read_compact, workers, answered_from_text=answered_from_text)
+    # Dagen zonder bijv. Beantwoord krijgen die kolom pas bij het normaliseren;
+    # zonder vaste volgorde zou de eerste dag de kolomvolgorde bepalen
+    return order_columns(df)
+
+
+def order_columns(df):
+    """Kolommen in de volgorde van de logbestanden, onbekende daarna, Bestand en Uur achteraan."""
+    tail = [c for c in ("Bestand", "Uur") if c in df.columns]
+    known = [c for c in LOG_COLUMNS if c in df.columns]
+    rest = [c for c in df.columns if c not in known and c not in tail]
+    return df[known + rest + tail]
+
+
+def _union_column(parts):
+    # Eén categoriekolom over alle dagen; categorieën gesorteerd, want sorteren
+    # op een categoriekolom volgt de codes (anders niet alfabetisch in de logtabel)
+    parts = [p if isinstance(p.dtype, pd.CategoricalDtype) else p.astype("category") for p in parts]
+    if len({p.cat.categories.dtype for p in parts}) > 1:
+        # Bijv. een lege dag (object) naast een dag met getallen: samen als object
+        parts = [p.astype(pd.CategoricalDtype(p.cat.categories.astype(object))) for p in parts]
+    try:
+        return union_categoricals(parts, sort_categories=True, ignore_order=True)
+    except TypeError:
+        # Gemengde types (bijv. bool naast tekst) sorteren als tekst
+        merged = union_categoricals(parts, ignore_order=True)
+        return merged.reorder_categories(sorted(merged.categories, key=str))
+
+
+def concat_frames(frames):
+    """pd.concat dat categoriekolommen als (gesorteerde) categorie houdt, ook als elke dag andere categorieën heeft."""
+    if not frames:
+        return pd.DataFrame()
+    columns = list(dict.fromkeys(c for f in frames for c in f.columns))
+    categorical = [
+        col for col in columns
+        if any(isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames if col in f.columns)
+    ]
+    if not categorical:
+        return pd.concat(frames, ignore_index=True)
+
+    # Alleen de overige kolommen via pd.concat; categorieën in één keer per kolom
+    # samenvoegen is veel sneller dan elke dag eerst naar een gezamenlijk dtype omzetten
+    rest = pd.concat([f.drop(columns=[c for c in categorical if c in f.columns]) for f in frames],
+                     ignore_index=True)
+    merged = {}
+    for col in categorical:
+        parts = [
+            f[col] if col in f.columns else pd.Series(pd.Categorical([None] * len(f)), index=f.index)
+            for f in frames
+        ]
+        merged[col] = _union_column(parts)
+    return rest.assign(**merged)[columns]
+
+
+def normalize_logs(df):
+    """Vul ontbrekende waarden aan en leid het uur af, zoals beide dashboards verwachten."""
+    df["Categorie"] = df["Categorie"].fillna("Onbekend")
+    if "Beantwoord" not in df.columns:
+        df["Beantwoord"] = None
+    df["Beantwoord"] = df["Beantwoord"].fillna("Nee")
+    if "Reden" not in df.columns:
+        df["Reden"] = None
+    df["Tijdstip"] = pd.to_datetime(df["Tijdstip"], errors="coerce")
+    df["Uur"] = df["Tijdstip"].dt.hour
+    return df
+
+
+def compact_logs(df):
+    """Zuinige dtypes: categorieën voor herhalende tekst en Uur als Int8."""
+    for col in df.columns[df.dtypes == object]:
+        if col in CATEGORY_COLUMNS or df[col].nunique() <= len(df) // 2:
+            df[col] = df[col].astype("category")
+    if "Uur" in df.columns:
+        df["Uur"] = df["Uur"].astype("Int8")
+    return df
+
+
+def file_starts(df):
+    """Eerste rijpositie per bestand in een frame uit load_frames (bestanden staan aaneengesloten)."""
+    codes, names = pd.factorize(df["Bestand"])
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else []
+    return {names[codes[start]]: int(start) for start in starts}
+
+
+def load_text(df, rows, log_files, columns=TEXT_COLUMNS):
+    """Vrije-tekstkolommen voor alleen de rijposities `rows` van een frame zonder tekst.
+
+    Bestanden staan aaneengesloten in df (load_frames), dus positie min de eerste
+    rij van het bestand is de regel binnen die dag.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    text = pd.DataFrame(None, index=df.index[rows], columns=list(columns), dtype=object)
+    if not len(rows):
+        return text
+
+    paths = {os.path.basename(p): p for p in log_files}
+    codes, names = pd.factorize(df["Bestand"])
+    starts = file_starts(df)
+    row_codes = codes[rows]
+    for code in np.unique(row_codes):
+        selected = np.flatnonzero(row_codes == code)
+        day = read_log(paths[names[code]])
+        offsets = rows[selected] - starts[names[code]]
+        for i, col in enumerate(text.columns):
+            if col in day.columns:
+                text.iloc[selected, i] = day[col].to_numpy()[offsets]
+    return text
+
+
+def with_text(df, rows, log_files):
+    """df.take(rows) aangevuld met de vrije tekst, in de kolomvolgorde van de logs (bijv. voor een export)."""
+    return order_columns(df.take(rows).join(load_text(df, rows, log_files)))
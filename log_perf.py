@@ -0,0 +1,137 @@
+# 📂 log_perf.py
+# Lichte tijdmeting per fase van een Streamlit-rerun.
+# Het dashboard start per rerun een meting (start_run); modules die iets
+# zwaars doen roepen phase()/record() aan. Zonder lopende meting (procespool,
+# report worker, CLI) zijn dat no-ops. Per rerun komen er tijden, rijaantallen
+# en de cache hits/misses van de gedeelde store en de grafiekcache uit; met
+# MAILMIND_METRICS_LOG worden ze als JSON-regel in een roterend logbestand gezet.
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+METRICS_LOG = os.getenv("MAILMIND_METRICS_LOG")
+METRICS_LOG_MB = int(os.getenv("MAILMIND_METRICS_LOG_MB", "5"))
+METRICS_LOG_BACKUPS = 3
+
+_local = threading.local()
+
+
+class RunMetrics:
+    def __init__(self, label):
+        self.label = label
+        self.started_at = datetime.now()
+        self.phases = []
+        self.counters = {}
+        self.total_seconds = None
+        self._start = time.perf_counter()
+        self._depth = 0
+        self._counters_start = counter_snapshot()
+
+    def record(self, name, seconds, rows=None):
+        self.phases.append({"fase": name, "niveau": self._depth, "seconden": seconds, "rijen": rows})
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def finish(self):
+        self.total_seconds = self.elapsed()
+        end = counter_snapshot()
+        self.counters = {
+            cache: {name: end[cache][name] - self._counters_start[cache].get(name, 0) for name in end[cache]}
+            for cache in end
+        }
+        return self
+
+    def as_dict(self):
+        return {
+            "label": self.label,
+            "tijd": self.started_at.isoformat(timespec="seconds"),
+            "totaal_seconden": self.total_seconds,
+            "fasen": self.phases,
+            "caches": self.counters,
+        }
+
+
+def counter_snapshot():
+    # Lazy imports: log_perf wordt ook door log_loader en log_charts gebruikt
+    from log_charts import stats as chart_stats
+    from log_store import get_store
+
+    return {"store": dict(get_store().stats), "grafieken": dict(chart_stats)}
+
+
+def hit_rate(counters):
+    lookups = counters.get("hits", 0) + counters.get("misses", 0)
+    return counters.get("hits", 0) / lookups if lookups else None
+
+
+def current_run():
+    return getattr(_local, "run", None)
+
+
+def start_run(label):
+    """Begin een meting voor de rerun in deze thread (één Streamlit-sessie)."""
+    _local.run = RunMetrics(label)
+    return _local.run
+
+
+def finish_run():
+    run = current_run()
+    if run is None:
+        return None
+    _local.run = None
+    run.finish()
+    if METRICS_LOG:
+        _metrics_logger().info(json.dumps(run.as_dict(), default=str))
+    return run
+
+
+def record(name, seconds, rows=None):
+    run = current_run()
+    if run is not None:
+        run.record(name, seconds, rows)
+
+
+@contextmanager
+def phase(name, rows=None):
+    """Meet een blok; het aantal rijen mag ook binnen het blok via info["rows"] gezet worden."""
+    run = current_run()
+    info = {"rows": rows}
+    if run is None:
+        yield info
+        return
+    index = len(run.phases)
+    run.record(name, 0.0, rows)
+    run._depth += 1
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        run._depth -= 1
+        run.phases[index]["seconden"] = time.perf_counter() - start
+        run.phases[index]["rijen"] = info["rows"]
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def _metrics_logger():
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            os.makedirs(os.path.dirname(os.path.abspath(METRICS_LOG)), exist_ok=True)
+            handler = RotatingFileHandler(METRICS_LOG, maxBytes=METRICS_LOG_MB * 1024 * 1024,
+                                          backupCount=METRICS_LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _logger = logging.getLogger("mailmind.metrics")
+            _logger.setLevel(logging.INFO)
+            _logger.propagate = False
+            _logger.addHandler(handler)
+        return _logger
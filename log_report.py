@@ -0,0 +1,94 @@
+# 📂 log_report.py
+# PDF-rapport en verzending per mail.
+# Wordt gedeeld door de Export-tab, de achtergrondworker en (later) batch-
+# rapportages, zodat de inhoud van het rapport op één plek staat. De cijfers
+# komen uit cube_metrics(); verzenden gebruikt één SMTP-verbinding voor alle
+# ontvangers.
+
+import os
+import smtplib
+from datetime import datetime
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from email.mime.application import MIMEApplication
+from io import BytesIO
+
+from fpdf import FPDF
+
+REPORT_BODY = "Beste manager,\n\nIn de bijlage vindt u het dagelijkse MailMind rapport.\n\nGroeten,\nMailMind"
+
+
+def build_pdf_report(metrics, report_date=None, logo_path=None):
+    """PDF-bytes met de kerncijfers van één periode."""
+    report_date = report_date or datetime.now().strftime("%Y-%m-%d")
+
+    pdf = FPDF()
+    pdf.add_page()
+    if logo_path and os.path.exists(logo_path):
+        pdf.image(logo_path, x=10, y=8, w=25)
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(200, 10, "MailMind Rapport", ln=True, align="C")
+
+    pdf.set_font("Arial", "", 12)
+    pdf.cell(200, 10, f"Datum: {report_date}", ln=True)
+    pdf.ln(10)
+    pdf.cell(200, 10, f"Totaal e-mails: {metrics['total']}", ln=True)
+    pdf.cell(200, 10, f"AI beantwoord: {metrics['answered']} ({metrics['answered_pct']:.0f}%)", ln=True)
+    pdf.cell(200, 10, f"Fallbacks: {metrics['fallbacks']} ({metrics['fallback_pct']:.0f}%)", ln=True)
+    pdf.cell(200, 10, f"Klachten: {metrics['complaints']}", ln=True)
+
+    pdf_buffer = BytesIO()
+    pdf.output(pdf_buffer)
+    return pdf_buffer.getvalue()
+
+
+def _env_flag(name, default):
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "ja", "yes", "on")
+
+
+def smtp_settings():
+    """SMTP-instellingen uit de omgeving (.env.dashboard)."""
+    return {
+        "server": os.getenv("SMTP_SERVER"),
+        "port": int(os.getenv("SMTP_PORT") or 587),
+        "user": os.getenv("SMTP_USER"),
+        "password": os.getenv("SMTP_PASS"),
+        "ssl": _env_flag("SMTP_SSL", False),
+        "starttls": _env_flag("SMTP_STARTTLS", True),
+        "sender": os.getenv("SMTP_USER"),
+        "recipients": [r.strip() for r in (os.getenv("REPORT_EMAIL") or "").split(",") if r.strip()],
+    }
+
+
+def _report_message(pdf_bytes, sender, recipient, report_date):
+    msg = MIMEMultipart()
+    msg["From"] = sender
+    msg["To"] = recipient
+    msg["Subject"] = f"MailMind Rapport - {report_date}"
+    msg.attach(MIMEText(REPORT_BODY, "plain"))
+
+    attachment = MIMEApplication(pdf_bytes, _subtype="pdf")
+    attachment.add_header("Content-Disposition", "attachment", filename="rapport.pdf")
+    msg.attach(attachment)
+    return msg
+
+
+def send_report(pdf_bytes, report_date, settings=None):
+    """Mail het rapport naar alle ontvangers over één SMTP-verbinding."""
+    settings = settings or smtp_settings()
+    if not settings["recipients"]:
+        return 0
+
+    smtp_class = smtplib.SMTP_SSL if settings["ssl"] else smtplib.SMTP
+    with smtp_class(settings["server"], settings["port"], timeout=30) as server:
+        if settings["starttls"] and not settings["ssl"]:
+            server.starttls()
+        if settings["user"]:
+            server.login(settings["user"], settings["password"])
+        for recipient in settings["recipients"]:
+            msg = _report_message(pdf_bytes, settings["sender"], recipient, report_date)
+            server.sendmail(settings["sender"], [recipient], msg.as_string())
+    return len(settings["recipients"])
@@ -0,0 +1,131 @@
+# 📂 log_search.py
+# Vrije-tekstzoeken in Antwoord, Reden en Afzender.
+# Per logdag wordt één keer een lijst (term, regel) opgebouwd en naast de
+# andere caches bewaard (logs/.cache/*.search.parquet). Per dataversie worden
+# die dagen samengevoegd tot een omgekeerde index: een gesorteerde woordenlijst
+# (voor prefixen via bisect) en per term de rijposities in het geladen frame.
+# Een zoekopdracht is dan een paar bisects en een doorsnede van arrays.
+#
+#   retour            → rijen met het woord "retour"
+#   terugbet*         → rijen met een woord dat met "terugbet" begint
+#   retour levering   → beide woorden (EN)
+
+import os
+import re
+import sys
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from log_cache import cached_frame, check_log, read_log
+from log_loader import file_starts, load_frames
+from log_store import shared_frame
+
+SEARCH_KIND = ".search"
+SEARCH_COLUMNS = ("Antwoord", "Reden", "Afzender")
+TOKEN_RE = r"\w{2,}"
+QUERY_RE = re.compile(r"(\w+)(\*?)")
+
+
+def build_postings(df):
+    """Unieke (term, regel)-paren van één dag, term als categorie."""
+    parts = []
+    for col in SEARCH_COLUMNS:
+        if col not in df.columns:
+            continue
+        text = df[col].dropna().astype(str)
+        tokens = text.str.lower().str.findall(TOKEN_RE).explode().dropna()
+        parts.append(pd.DataFrame({"term": tokens.to_numpy(dtype=object), "regel": tokens.index.to_numpy()}))
+    if not parts:
+        return pd.DataFrame({"term": pd.Categorical([]), "regel": np.array([], dtype=np.int32)})
+    postings = pd.concat(parts, ignore_index=True).drop_duplicates()
+    return pd.DataFrame({
+        "term": pd.Categorical(postings["term"]),
+        "regel": postings["regel"].astype(np.int32).to_numpy(),
+    })
+
+
+def _build_file_postings(path):
+    return build_postings(read_log(path).reset_index(drop=True))
+
+
+def _read_postings(path):
+    try:
+        check_log(path)
+        postings = cached_frame(path, SEARCH_KIND, _build_file_postings)
+    except Exception:
+        return None
+    postings["Bestand"] = pd.Categorical.from_codes(np.zeros(len(postings), dtype=np.int8), [os.path.basename(path)])
+    return postings
+
+
+class TextIndex:
+    def __init__(self, day_postings, starts):
+        frames = [f for f in day_postings if f["Bestand"].iat[0] in starts]
+        if not frames:
+            self._terms, self._term_ids = [], np.array([], dtype=np.int64)
+            self._positions = np.array([], dtype=np.int64)
+            self._bounds = np.zeros(1, dtype=np.int64)
+            return
+
+        terms = union_categoricals([f["term"] for f in frames])
+        codes = terms.codes.astype(np.int64)
+        positions = np.concatenate([
+            f["regel"].to_numpy(dtype=np.int64) + starts[f["Bestand"].iat[0]] for f in frames
+        ])
+        order = np.lexsort((positions, codes))
+        self._positions = positions[order]
+        self._bounds = np.searchsorted(codes[order], np.arange(len(terms.categories) + 1))
+
+        vocabulary = terms.categories.to_numpy(dtype=object)
+        vocab_order = np.argsort(vocabulary)
+        self._terms = vocabulary[vocab_order].tolist()
+        self._term_ids = vocab_order
+
+    @property
+    def nbytes(self):
+        # Arrays exact; de woordenlijst geschat (Python-strings plus lijstpointers)
+        arrays = self._positions.nbytes + self._bounds.nbytes + self._term_ids.nbytes
+        return arrays + sum(sys.getsizeof(t) for t in self._terms) + 8 * len(self._terms)
+
+    def _term_rows(self, term, prefix=False):
+        lo = bisect_left(self._terms, term)
+        if prefix:
+            hi = bisect_left(self._terms, term + "\U0010ffff", lo)
+        else:
+            hi = lo + 1 if lo < len(self._terms) and self._terms[lo] == term else lo
+        ids = self._term_ids[lo:hi]
+        if len(ids) == 1:
+            term_id = ids[0]
+            return self._positions[self._bounds[term_id]:self._bounds[term_id + 1]]
+        return np.unique(np.concatenate(
+            [self._positions[self._bounds[i]:self._bounds[i + 1]] for i in ids]
+        )) if len(ids) else np.array([], dtype=np.int64)
+
+    def rows(self, query):
+        """Oplopende rijposities die alle termen bevatten, of None bij een lege zoekopdracht."""
+        result = None
+        for term, star in QUERY_RE.findall((query or "").lower()):
+            if len(term) < 2 and not star:
+                continue
+            rows = self._term_rows(term, prefix=bool(star))
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+            if not len(result):
+                break
+        return result
+
+
+def get_text_index(version, log_files, df, workers=None):
+    """Zoekindex per dataversie voor de rijposities van df (frame uit load_frames).
+
+    De index en de postings per dag staan in de gedeelde store en tellen mee
+    voor het geheugenbudget; na een wijziging wordt alleen de gewijzigde dag
+    opnieuw ingelezen.
+    """
+    def build():
+        day_postings = load_frames(log_files, _read_postings, workers, combine=False)
+        return TextIndex(day_postings, file_starts(df))
+
+    return shared_frame(("text_index", version), build)
@@ -0,0 +1,201 @@
+# 📂 log_similar.py
+# Vergelijkbare historische antwoorden bij fallback-mails.
+# logs/historical_responses_cleaned.xlsx wordt één keer omgezet naar een
+# TF-IDF-matrix (schaars, rijen L2-genormaliseerd) en als .npz naast de andere
+# caches bewaard, met mtime en grootte in de naam. Alle fallbacks van een
+# periode worden daarna in één keer gescoord: vectoren van de nieuwe mails maal
+# de getransponeerde historie geeft in één matrixproduct de cosinus-
+# gelijkenis met elk historisch antwoord, in blokken om het geheugen te begrenzen.
+
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from log_cache import (QuarantinedLog, cache_dir_for, cache_path, drop_stale, file_signature, read_log,
+                       remove_quietly, temp_path)
+from log_search import TOKEN_RE
+
+HISTORY_FILE = "historical_responses_cleaned.xlsx"
+SIMILAR_KIND = ".tfidf"
+MODEL_EXT = ".npz"
+QUESTION_COLUMNS = ("Onderwerp", "Inhoud")
+TOP_K = 3
+BATCH_ROWS = 2000
+# Vanaf deze cosinus-gelijkenis lijkt een historisch antwoord bruikbaar
+MATCH_THRESHOLD = float(os.getenv("MAILMIND_SIMILAR_THRESHOLD", "0.5"))
+
+_token_re = re.compile(TOKEN_RE)
+
+
+def question_text(df):
+    """Onderwerp en inhoud samen als één tekst per rij."""
+    parts = [df[c].astype(object).fillna("").astype(str) for c in QUESTION_COLUMNS if c in df.columns]
+    if not parts:
+        return pd.Series("", index=df.index)
+    text = parts[0]
+    for part in parts[1:]:
+        text = text + " " + part
+    return text
+
+
+class TfidfModel:
+    def __init__(self, vocabulary, idf, matrix):
+        self.vocabulary = vocabulary          # term -> kolomnummer
+        self.idf = idf
+        self.matrix = matrix.tocsr()          # historie × termen, rijen genormaliseerd
+        self._matrix_t = self.matrix.T.tocsr()
+
+    @classmethod
+    def fit(cls, texts):
+        tokens = [_token_re.findall(t.lower()) for t in texts]
+        vocabulary = {term: i for i, term in enumerate(sorted({t for doc in tokens for t in doc}))}
+        counts = _count_matrix(tokens, vocabulary)
+        df = np.bincount(counts.indices, minlength=len(vocabulary))
+        idf = np.log((1 + counts.shape[0]) / (1 + df)) + 1.0
+        return cls(vocabulary, idf, _weigh(counts, idf))
+
+    def transform(self, texts):
+        tokens = [_token_re.findall(t.lower()) for t in texts]
+        return _weigh(_count_matrix(tokens, self.vocabulary), self.idf)
+
+    def save(self, path):
+        terms = np.empty(len(self.vocabulary), dtype=object)
+        for term, i in self.vocabulary.items():
+            terms[i] = term
+        with open(path, "wb") as f:
+            np.savez_compressed(f, terms=terms.astype(str), idf=self.idf, data=self.matrix.data,
+                                indices=self.matrix.indices, indptr=self.matrix.indptr,
+                                shape=np.array(self.matrix.shape))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            vocabulary = {term: i for i, term in enumerate(f["terms"].tolist())}
+            matrix = sparse.csr_matrix((f["data"], f["indices"], f["indptr"]), shape=tuple(f["shape"]))
+            return cls(vocabulary, f["idf"], matrix)
+
+
+def _count_matrix(tokens, vocabulary):
+    # Onbekende termen vallen weg; dubbele (rij, term)-paren telt scipy op
+    rows, cols = [], []
+    for i, doc in enumerate(tokens):
+        ids = [vocabulary[t] for t in doc if t in vocabulary]
+        rows.extend([i] * len(ids))
+        cols.extend(ids)
+    counts = sparse.csr_matrix((np.ones(len(cols), dtype=np.float64), (rows, cols)),
+                               shape=(len(tokens), len(vocabulary)))
+    counts.sum_duplicates()
+    return counts
+
+
+def _weigh(counts, idf):
+    # Sublineaire tf (1 + log) maal idf, daarna elke rij op lengte 1
+    weighted = counts.copy()
+    weighted.data = (1.0 + np.log(weighted.data)) * idf[weighted.indices]
+    norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return (sparse.diags(1.0 / norms) @ weighted).tocsr()
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_history(logs_dir):
+    """(historie, model) voor de huidige versie van het historiebestand, of (None, None) zonder bestand."""
+    path = os.path.join(logs_dir, HISTORY_FILE)
+    try:
+        signature = file_signature(path)
+    except OSError:
+        return None, None
+
+    key = (os.path.abspath(path), signature)
+    with _models_lock:
+        if key in _models:
+            return _models[key]
+
+    try:
+        history = read_log(path).reset_index(drop=True)
+    except QuarantinedLog:
+        return None, None
+    model_path = cache_path(path, signature, SIMILAR_KIND, ext=MODEL_EXT)
+    model = None
+    if os.path.exists(model_path):
+        try:
+            model = TfidfModel.load(model_path)
+        except Exception:
+            model = None
+    if model is None or model.matrix.shape[0] != len(history):
+        model = TfidfModel.fit(question_text(history))
+        tmp_path = temp_path(model_path)
+        try:
+            os.makedirs(cache_dir_for(path), exist_ok=True)
+            model.save(tmp_path)
+            os.replace(tmp_path, model_path)
+            drop_stale(path, model_path, kind=SIMILAR_KIND, ext=MODEL_EXT)
+        except OSError:
+            pass
+        finally:
+            remove_quietly(tmp_path)
+
+    with _models_lock:
+        # Alleen de laatste versie bewaren; oudere versies zijn nooit meer nodig
+        _models.clear()
+        _models[key] = (history, model)
+    return history, model
+
+
+def top_matches(model, texts, top_k=TOP_K, batch_rows=BATCH_ROWS):
+    """(indices, scores) van de top_k meest gelijkende historische rijen per tekst, best eerst."""
+    n_history = model.matrix.shape[0]
+    top_k = min(top_k, n_history)
+    indices = np.zeros((len(texts), top_k), dtype=np.int64)
+    scores = np.zeros((len(texts), top_k), dtype=np.float64)
+    if not len(texts) or not top_k:
+        return indices, scores
+
+    queries = model.transform(texts)
+    for start in range(0, queries.shape[0], batch_rows):
+        block = (queries[start:start + batch_rows] @ model._matrix_t).toarray()
+        if top_k < n_history:
+            best = np.argpartition(-block, top_k - 1, axis=1)[:, :top_k]
+        else:
+            best = np.broadcast_to(np.arange(n_history), block.shape).copy()
+        best_scores = np.take_along_axis(block, best, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        indices[start:start + len(block)] = np.take_along_axis(best, order, axis=1)
+        scores[start:start + len(block)] = np.take_along_axis(best_scores, order, axis=1)
+    return indices, scores
+
+
+def similar_responses(logs_dir, fallbacks, top_k=TOP_K):
+    """Per fallback-rij de top_k historische antwoorden met score > 0; leeg zonder historie.
+
+    fallbacks heeft Onderwerp en/of Inhoud; de index blijft behouden in kolom "Regel".
+    """
+    columns = ["Regel", "Rang", "Score", "Historisch onderwerp", "Historische categorie", "Historisch antwoord"]
+    history, model = load_history(logs_dir)
+    if model is None or not model.matrix.shape[0] or fallbacks.empty:
+        return pd.DataFrame(columns=columns)
+
+    indices, scores = top_matches(model, question_text(fallbacks).tolist(), top_k)
+    k = indices.shape[1]
+    matched = history.take(indices.ravel())
+
+    def pick(col):
+        return matched[col].to_numpy() if col in matched.columns else np.full(len(matched), None)
+
+    result = pd.DataFrame({
+        "Regel": np.repeat(fallbacks.index.to_numpy(), k),
+        "Rang": np.tile(np.arange(1, k + 1), len(fallbacks)),
+        "Score": scores.ravel().round(3),
+        "Historisch onderwerp": pick("Onderwerp"),
+        "Historische categorie": pick("Categorie"),
+        "Historisch antwoord": pick("Antwoord"),
+    }, columns=columns)
+    # Zonder enkele gedeelde term is een "match" geen match
+    return result[result["Score"] > 0].reset_index(drop=True)
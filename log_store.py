@@ -0,0 +1,119 @@
+# 📂 log_store.py
+# Gedeelde in-memory opslag voor ingelezen logdagen en afgeleide tabellen.
+# Streamlit draait alle browsersessies in één proces; zonder deze store laadt
+# elke sessie haar eigen kopie van dezelfde logs. Frames worden hier één keer
+# per dataversie bewaard en door alle sessies alleen gelezen (nooit aanpassen,
+# eerst .copy()/.assign()). Boven het geheugenbudget vallen de minst recent
+# gebruikte items eruit.
+
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+STORE_BUDGET_MB = int(os.getenv("MAILMIND_STORE_MB", "512"))
+
+
+def frame_bytes(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    # Andere items (arrays, zoekindex) geven zelf hun grootte via nbytes
+    return int(getattr(value, "nbytes", 0))
+
+
+class DataStore:
+    def __init__(self, budget_mb=STORE_BUDGET_MB):
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+        self.used_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.stats["misses"] += 1
+                return None
+            self._items.move_to_end(key)
+            self.stats["hits"] += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = frame_bytes(value)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.used_bytes -= old[1]
+            if size > self.budget_bytes:
+                # Past nooit: wel teruggeven, niet bewaren
+                return value
+            self._items[key] = (value, size)
+            self.used_bytes += size
+            while self.used_bytes > self.budget_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.used_bytes -= evicted_size
+                self.stats["evictions"] += 1
+        return value
+
+    def get_or_load(self, key, load):
+        """Waarde uit de store, of load() één keer uitvoeren (ook bij gelijktijdige sessies)."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                item = self._items.get(key)
+            if item is not None:
+                return item[0]
+            try:
+                return self.put(key, load())
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+
+    def discard_older(self, key, version_len):
+        """Verwijder items die alleen in hun laatste version_len sleuteldelen van key verschillen."""
+        prefix = key[:-version_len]
+        with self._lock:
+            for old in [k for k in self._items if k != key and k[:-version_len] == prefix]:
+                self.used_bytes -= self._items.pop(old)[1]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.used_bytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def info(self):
+        with self._lock:
+            return {
+                "items": len(self._items),
+                "used_mb": self.used_bytes / 1024 / 1024,
+                "budget_mb": self.budget_bytes / 1024 / 1024,
+                **self.stats,
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Eén store per proces, gedeeld door alle sessies."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DataStore()
+        return _store
+
+
+def shared_frame(key, load):
+    return get_store().get_or_load(key, load)
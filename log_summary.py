@@ -0,0 +1,141 @@
+# 📂 log_summary.py
+# Incrementeel bijgehouden dagoverzicht van alle mail_logs.
+# Per (Bestand, Datum, Uur, Categorie) bewaren we alleen tellingen: totaal, beantwoord,
+# klachten en fallbacks. Gemiddelden over alle logs en dagreeksen in de Trends-tab
+# worden dan opgeteld uit een paar honderd samenvattingsrijen in plaats van uit
+# alle ruwe rijen. Alleen nieuwe of gewijzigde logbestanden worden opnieuw geteld.
+
+import os
+import pandas as pd
+
+from log_cache import CACHE_DIR_NAME, CACHE_EXT, data_version, file_signature, read_frame, read_log, write_frame
+from log_index import get_log_index
+from log_store import shared_frame
+
+SUMMARY_NAME = f"daily_summary{CACHE_EXT}"
+SUMMARY_COLUMNS = [
+    "Bestand", "mtime", "size", "Datum", "Uur", "Categorie",
+    "Totaal", "Beantwoord", "Klachten", "Fallbacks",
+]
+
+
+def summarize_log(df, name, signature):
+    """Tel één ingelezen logbestand samen tot rijen per (Datum, Uur, Categorie)."""
+    if df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    categorie = df["Categorie"].fillna("Onbekend") if "Categorie" in df.columns else pd.Series("Onbekend", index=df.index)
+    beantwoord = df["Beantwoord"].fillna("Nee") if "Beantwoord" in df.columns else pd.Series("Nee", index=df.index)
+    reden = df["Reden"] if "Reden" in df.columns else pd.Series(None, index=df.index, dtype=object)
+    tijdstip = pd.to_datetime(df["Tijdstip"], errors="coerce")
+
+    counts = pd.DataFrame({
+        "Datum": tijdstip.dt.normalize(),
+        "Uur": tijdstip.dt.hour,
+        "Categorie": categorie.astype(str),
+        "Totaal": 1,
+        "Beantwoord": (beantwoord == "Ja").astype(int),
+        "Klachten": categorie.astype(str).str.contains("klacht", case=False, na=False).astype(int),
+        "Fallbacks": (reden.fillna("").astype(str).str.strip() != "").astype(int),
+    })
+    summary = counts.groupby(["Datum", "Uur", "Categorie"], dropna=False, as_index=False).sum()
+    summary.insert(0, "Bestand", name)
+    summary.insert(1, "mtime", signature[0])
+    summary.insert(2, "size", signature[1])
+    return summary[SUMMARY_COLUMNS]
+
+
+def _marker_row(name, signature):
+    # Onleesbare of lege logs krijgen één rij zonder tellingen, zodat ook hun
+    # versie bekend is en ze pas bij een nieuwe mtime/grootte opnieuw gelezen worden.
+    marker = pd.DataFrame({"Bestand": [name], "mtime": [signature[0]], "size": [signature[1]],
+                           "Datum": pd.Series([pd.NaT], dtype="datetime64[ns]"),
+                           "Uur": pd.Series([pd.NA], dtype="Int64"), "Categorie": ["Onbekend"]})
+    for col in ["Totaal", "Beantwoord", "Klachten", "Fallbacks"]:
+        marker[col] = 0
+    return marker[SUMMARY_COLUMNS]
+
+
+def _summary_path(logs_dir):
+    return os.path.join(logs_dir, CACHE_DIR_NAME, SUMMARY_NAME)
+
+
+def _read_summary(path):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    try:
+        stored = read_frame(path)
+    except Exception:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    # Overzicht in een oudere opzet (bijv. nog zonder Uur): eenmalig opnieuw opbouwen
+    if list(stored.columns) != SUMMARY_COLUMNS:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    return stored
+
+
+def load_daily_summary(logs_dir, log_files=None):
+    """Geef het dagoverzicht terug en werk alleen gewijzigde bestanden bij.
+
+    Per versie van de logbestanden gedeeld tussen sessies: zolang er niets
+    verandert, wordt het Parquet-bestand niet opnieuw gelezen. Niet aanpassen.
+    """
+    if log_files is None:
+        log_files = get_log_index(logs_dir).all_files()
+    key = ("daily_summary", os.path.abspath(logs_dir), data_version(log_files))
+    return shared_frame(key, lambda: _update_summary(logs_dir, log_files))
+
+
+def _update_summary(logs_dir, log_files):
+    path = _summary_path(logs_dir)
+    stored = _read_summary(path)
+    known = {
+        row.Bestand: (int(row.mtime), int(row.size))
+        for row in stored[["Bestand", "mtime", "size"]].drop_duplicates("Bestand").itertuples()
+    }
+
+    parts = []
+    refreshed = set()
+    current_names = set()
+    for log_path in sorted(log_files):
+        name = os.path.basename(log_path)
+        try:
+            signature = file_signature(log_path)
+        except OSError:
+            continue
+        current_names.add(name)
+        if known.get(name) == signature:
+            continue
+        refreshed.add(name)
+        try:
+            part = summarize_log(read_log(log_path), name, signature)
+        except Exception:
+            # Onleesbare bestanden tellen niet mee, net als bij het gewone inladen
+            part = pd.DataFrame(columns=SUMMARY_COLUMNS)
+        parts.append(part if not part.empty else _marker_row(name, signature))
+
+    removed = set(known) - current_names
+    if not refreshed and not removed:
+        return stored
+
+    keep = stored[~stored["Bestand"].isin(refreshed | removed)]
+    frames = [f for f in [keep] + parts if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    summary = pd.concat(frames, ignore_index=True)
+    summary = summary.astype({"mtime": "int64", "size": "int64", "Uur": "Int64", "Totaal": "int64",
+                              "Beantwoord": "int64", "Klachten": "int64", "Fallbacks": "int64"})
+    summary["Datum"] = pd.to_datetime(summary["Datum"])
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_frame(summary, path)
+    except Exception:
+        pass
+    return summary
+
+
+def daily_series(summary, files=None):
+    """Tellingen per dag, optioneel beperkt tot een set bestandsnamen."""
+    if files is not None:
+        summary = summary[summary["Bestand"].isin(files)]
+    return summary.groupby("Datum")[["Totaal", "Beantwoord", "Klachten", "Fallbacks"]].sum()
@@ -0,0 +1,98 @@
+# 📂 log_table.py
+# Gepagineerde logtabel met server-side sorteren en kleuren.
+# Filteren gebeurt al via rijposities (log_filters); hier wordt op die posities
+# gesorteerd en alleen de zichtbare pagina naar de browser gestuurd. De kleuren
+# voor klachten en onbeantwoorde mails komen uit gevectoriseerde maskers over
+# die ene pagina, niet uit een Python-functie per rij.
+
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [50, 100, 250, 500]
+NO_SORT = "(geen)"
+COMPLAINT_STYLE = "background-color: #fff3cd"
+UNANSWERED_STYLE = "background-color: #f8d7da"
+
+_orders = OrderedDict()
+_orders_lock = threading.Lock()
+MAX_ORDERS = 16
+
+
+def highlight_styles(page):
+    """CSS per cel: klachten geel, onbeantwoord rood (klacht gaat voor)."""
+    colors = np.select(
+        [page["Categorie"].eq("Klacht").to_numpy(), page["Beantwoord"].eq("Nee").to_numpy()],
+        [COMPLAINT_STYLE, UNANSWERED_STYLE],
+        "",
+    )
+    return pd.DataFrame(np.repeat(colors[:, None], page.shape[1], axis=1), index=page.index, columns=page.columns)
+
+
+def _sort_order(df, column, ascending):
+    values = df[column].reset_index(drop=True)
+    try:
+        ordered = values.sort_values(ascending=ascending, kind="stable", na_position="last")
+    except TypeError:
+        # Gemengde types (bijv. bool naast tekst) sorteren we als tekst
+        ordered = values.where(values.isna(), values.astype(str)).sort_values(
+            ascending=ascending, kind="stable", na_position="last")
+    return ordered.index.to_numpy()
+
+
+def sorted_rows(df, rows, column, ascending=True, version=None):
+    """Rijposities `rows` gesorteerd op `column`.
+
+    Met een dataversie wordt de volledige sorteervolgorde per kolom bewaard, zodat
+    een nieuwe filtercombinatie alleen nog een lineaire selectie kost.
+    """
+    if version is None:
+        subset = df.take(rows)
+        return np.asarray(rows)[_sort_order(subset, column, ascending)]
+
+    key = (version, column, ascending)
+    with _orders_lock:
+        order = _orders.get(key)
+        if order is not None:
+            _orders.move_to_end(key)
+    if order is None:
+        order = _sort_order(df, column, ascending)
+        with _orders_lock:
+            _orders[key] = order
+            while len(_orders) > MAX_ORDERS:
+                _orders.popitem(last=False)
+
+    if len(rows) == len(df):
+        return order
+    selected = np.zeros(len(df), dtype=bool)
+    selected[rows] = True
+    return order[selected[order]]
+
+
+def render_log_table(df, rows, key, highlight=False, version=None, load_text=None):
+    """Toon alleen de huidige pagina van df.take(rows), met sorteer- en paginakeuze.
+
+    Met load_text(page_rows) kan de vrije tekst voor alleen die pagina worden bijgeladen.
+    """
+    total = len(rows)
+    col_sort, col_dir, col_size, col_page = st.columns([2, 1, 1, 1])
+    sort_by = col_sort.selectbox("Sorteer op", [NO_SORT] + list(df.columns), key=f"{key}_sort")
+    direction = col_dir.selectbox("Volgorde", ["Oplopend", "Aflopend"], key=f"{key}_dir")
+    page_size = col_size.selectbox("Rijen per pagina", PAGE_SIZES, key=f"{key}_size")
+    n_pages = max(1, math.ceil(total / page_size))
+    page = col_page.number_input("Pagina", min_value=1, max_value=n_pages, value=1, step=1, key=f"{key}_page_{n_pages}")
+
+    if sort_by != NO_SORT:
+        rows = sorted_rows(df, rows, sort_by, ascending=direction == "Oplopend", version=version)
+
+    start = (page - 1) * page_size
+    page_rows = rows[start:start + page_size]
+    page_df = df.take(page_rows)
+    if load_text is not None and st.checkbox("📝 Toon volledige tekst", key=f"{key}_text"):
+        page_df = page_df.join(load_text(page_rows))
+    st.dataframe(page_df.style.apply(highlight_styles, axis=None) if highlight else page_df)
+    st.caption(f"Rij {min(start + 1, total)}–{min(start + page_size, total)} van {total} (pagina {page} van {n_pages})")
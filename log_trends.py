@@ -0,0 +1,89 @@
+# 📂 log_trends.py
+# Trendreeksen per uur, dag, ISO-week en maand over willekeurig lange periodes.
+# Alles komt uit het incrementeel bijgehouden dagoverzicht (log_summary), dus
+# ook meerdere jaren zonder één ruwe logregel te laden. De rollups worden per
+# versie van het overzicht één keer berekend en in de gedeelde store bewaard;
+# komt er een log bij, dan wordt alleen dat bestand opnieuw samengevat.
+# Wie het overzicht al heeft (één keer per rerun), geeft het mee als summary.
+
+import os
+import pandas as pd
+
+from log_store import shared_frame
+from log_summary import load_daily_summary
+
+RESOLUTIONS = ["Uur", "Dag", "Week", "Maand"]
+TREND_COLUMNS = ["Totaal", "Beantwoord", "Klachten", "Fallbacks"]
+MAX_TREND_POINTS = int(os.getenv("MAILMIND_TREND_POINTS", "400"))
+
+# Periodebegin per resolutie (weken beginnen op maandag, zoals ISO-weken)
+_FREQ = {"Uur": "h", "Dag": "D", "Week": "W-MON", "Maand": "MS"}
+
+
+def summary_version(summary):
+    return tuple(summary[["Bestand", "mtime", "size"]].drop_duplicates("Bestand").itertuples(index=False, name=None))
+
+
+def build_rollup(summary, resolution):
+    """Tellingen per periodebegin op de gevraagde resolutie."""
+    valid = summary[summary["Datum"].notna()]
+    if resolution == "Uur":
+        start = valid["Datum"] + pd.to_timedelta(valid["Uur"].fillna(0).astype("int64"), unit="h")
+    elif resolution == "Dag":
+        start = valid["Datum"]
+    elif resolution == "Week":
+        start = valid["Datum"] - pd.to_timedelta(valid["Datum"].dt.weekday, unit="D")
+    elif resolution == "Maand":
+        start = valid["Datum"].dt.to_period("M").dt.to_timestamp()
+    else:
+        raise ValueError(f"Onbekende resolutie: {resolution}")
+    rollup = valid[TREND_COLUMNS].groupby(start.rename("Periode")).sum()
+    return rollup.astype("int64")
+
+
+def load_rollup(logs_dir, resolution, summary=None):
+    if summary is None:
+        summary = load_daily_summary(logs_dir)
+    key = ("trend", os.path.abspath(logs_dir), resolution, summary_version(summary))
+    return shared_frame(key, lambda: build_rollup(summary, resolution))
+
+
+def _period_start(value, resolution):
+    value = pd.Timestamp(value)
+    if resolution == "Uur":
+        return value.floor("h")
+    if resolution == "Week":
+        value = value.normalize()
+        return value - pd.Timedelta(days=value.weekday())
+    if resolution == "Maand":
+        return value.normalize().replace(day=1)
+    return value.normalize()
+
+
+def period_index(start, end, resolution):
+    """Alle periodebegins van start t/m end (end als hele dag)."""
+    last = pd.Timestamp(end).normalize() + pd.Timedelta(hours=23)
+    return pd.date_range(_period_start(start, resolution), _period_start(last, resolution),
+                         freq=_FREQ[resolution], name="Periode")
+
+
+def pick_resolution(start, end, max_points=MAX_TREND_POINTS):
+    """Fijnste resolutie waarbij de grafiek hooguit max_points punten krijgt."""
+    for resolution in RESOLUTIONS:
+        if len(period_index(start, end, resolution)) <= max_points:
+            return resolution
+    return RESOLUTIONS[-1]
+
+
+def trend_series(logs_dir, start, end, resolution=None, summary=None):
+    """(resolutie, tellingen) van start t/m end; lege periodes tellen als 0."""
+    resolution = resolution or pick_resolution(start, end)
+    rollup = load_rollup(logs_dir, resolution, summary)
+    return resolution, rollup.reindex(period_index(start, end, resolution), fill_value=0)
+
+
+def year_over_year(logs_dir, column="Totaal", summary=None):
+    """Maandtotalen met één kolom per jaar, om jaren naast elkaar te leggen."""
+    monthly = load_rollup(logs_dir, "Maand", summary)[column]
+    table = monthly.groupby([monthly.index.month.rename("Maand"), monthly.index.year.rename("Jaar")]).sum()
+    return table.unstack("Jaar").reindex(range(1, 13)).fillna(0).astype("int64")
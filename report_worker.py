@@ -0,0 +1,121 @@
+# 📂 report_worker.py
+# Eén achtergrondworker per proces voor het dagelijkse mailrapport.
+# Streamlit voert dashboard.py bij elke rerun en in elke sessie opnieuw uit;
+# start_report_worker() registreert de worker daarom maar één keer (de module
+# blijft in sys.modules staan). De worker laadt zelf de cijfers van de vorige
+# dag via de telkubus, bouwt de PDF in zijn eigen thread en mailt alle
+# ontvangers over één SMTP-verbinding.
+#
+# Los draaien kan ook:  python report_worker.py [--once] [--datum YYYY-MM-DD]
+
+import os
+import argparse
+import threading
+from datetime import date, datetime, timedelta
+
+from log_cube import cube_metrics, load_cube
+from log_index import get_log_index, period_range
+from log_report import build_pdf_report, send_report
+
+REPORT_TIME = os.getenv("REPORT_TIME", "08:00")
+
+
+def seconds_until(send_at, now=None):
+    """Seconden tot het eerstvolgende tijdstip HH:MM."""
+    now = now or datetime.now()
+    hour, minute = (int(part) for part in send_at.split(":"))
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+class ReportWorker:
+    def __init__(self, logs_dir, send_at=REPORT_TIME, logo_path=None, smtp_settings=None):
+        self.logs_dir = logs_dir
+        self.send_at = send_at
+        self.logo_path = logo_path
+        self.smtp_settings = smtp_settings
+        self.last_run = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def build_report(self, report_day):
+        files = get_log_index(self.logs_dir).files_between(*period_range("Dag", report_day))
+        # Geen procespool vanuit een achtergrondthread; één dag is klein genoeg
+        metrics = cube_metrics(load_cube(files, workers=1))
+        return build_pdf_report(metrics, report_day.strftime("%Y-%m-%d"), self.logo_path)
+
+    def run_once(self, report_day=None):
+        """Bouw en verstuur het rapport voor report_day (standaard: gisteren)."""
+        report_day = report_day or date.today() - timedelta(days=1)
+        try:
+            pdf_bytes = self.build_report(report_day)
+            sent = send_report(pdf_bytes, report_day.strftime("%Y-%m-%d"), self.smtp_settings)
+            self.last_error = None
+            print(f"✅ Rapport gemaild naar {sent} ontvanger(s)")
+            return sent
+        except Exception as e:
+            self.last_error = e
+            print("❌ Fout bij mailen rapport:", e)
+            return 0
+        finally:
+            self.last_run = datetime.now()
+
+    def _loop(self):
+        while not self._stop.wait(seconds_until(self.send_at)):
+            self.run_once()
+
+    def start(self):
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="mailmind-report-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def start_report_worker(logs_dir, **kwargs):
+    """Start de worker hooguit één keer per proces en geef hem terug."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = ReportWorker(logs_dir, **kwargs)
+        return _worker.start()
+
+
+def main():
+    from dotenv import load_dotenv
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    load_dotenv(os.path.join(base_dir, "Streamlit-dashboard", ".env.dashboard"))
+
+    parser = argparse.ArgumentParser(description="MailMind dagrapport versturen")
+    parser.add_argument("--logs", default=os.path.join(base_dir, "logs"), help="map met mail_log_*.xlsx")
+    parser.add_argument("--once", action="store_true", help="direct één rapport sturen en stoppen")
+    parser.add_argument("--datum", help="rapportdag (YYYY-MM-DD), standaard gisteren")
+    args = parser.parse_args()
+
+    worker = ReportWorker(args.logs)
+    if args.once:
+        report_day = datetime.strptime(args.datum, "%Y-%m-%d").date() if args.datum else None
+        worker.run_once(report_day)
+        return
+    worker._loop()
+
+
+if __name__ == "__main__":
+    main()